@@ -2,19 +2,27 @@
 Movie Suggester AI - FastAPI Application Entry Point (Simplified)
 """
 import os
-from typing import List, Optional
+import time
+import functools
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 from datetime import datetime
+import asyncio
 import logging
 import json
 
 # Import simplified modules
-from src.constants import AI_FALLBACK_ENABLED, AI_FALLBACK_MIN_SUGGESTIONS
-from src.llm_agent import LLMAgent
+from src.constants import (
+    AI_FALLBACK_ENABLED, AI_FALLBACK_MIN_SUGGESTIONS, SUGGESTION_CACHE_SIZE, SUGGESTION_CACHE_TTL,
+    SUGGESTION_CACHE_PARTIAL_TTL
+)
+from src.llm_agent import LLMAgent, SuggestionStreamParser
 from src.suggestion_engine import MovieSuggestionEngine
 from src.poster_service import PosterService
 # COMMENTED OUT - Language manager and search agent removed for simplicity
@@ -58,8 +66,10 @@ app = FastAPI(
     title="Movie Suggester AI",
     description="AI-powered movie suggestion API using DeepSeek with movie posters",
     version="0.2.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
+    default_response_class=ORJSONResponse,
+    # Docs pages are served below from HTML rendered once
+    docs_url=None,
+    redoc_url=None
 )
 
 # Initialize simplified components
@@ -86,6 +96,9 @@ except Exception as e:
     logger.error(f"Failed to initialize suggestion engine: {e}")
     suggestion_engine = None
 
+# Poster-enriched /suggest responses keyed by normalized prompt -> (expires_at, response)
+suggestion_cache: "OrderedDict[str, Tuple[float, SuggestionResponse]]" = OrderedDict()
+
 # Configure CORS
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 app.add_middleware(
@@ -96,6 +109,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@functools.lru_cache(maxsize=16)
+def _docs_page(page: str, root_path: str) -> str:
+    """Render a documentation page once per mount point; the OpenAPI schema itself is cached by FastAPI"""
+    # Like FastAPI's built-in docs routes, point at the schema under the proxy prefix
+    openapi_url = root_path.rstrip("/") + app.openapi_url
+    if page == "redoc":
+        html = get_redoc_html(openapi_url=openapi_url, title=f"{app.title} - ReDoc")
+    else:
+        html = get_swagger_ui_html(openapi_url=openapi_url, title=f"{app.title} - Swagger UI")
+    return html.body.decode()
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui_html(request: Request) -> HTMLResponse:
+    """Swagger UI documentation"""
+    return HTMLResponse(_docs_page("swagger", request.scope.get("root_path", "")))
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_html(request: Request) -> HTMLResponse:
+    """ReDoc documentation"""
+    return HTMLResponse(_docs_page("redoc", request.scope.get("root_path", "")))
+
 @app.get("/")
 async def root():
     """Root endpoint - API welcome and information"""
@@ -151,6 +185,11 @@ async def suggest_movies(request: SuggestionRequest):
     try:
         logger.info(f"Processing suggestion request: '{request.prompt[:50]}...'")
         
+        # Answer plain greetings and help requests without an LLM round trip
+        canned_response = _get_canned_suggestions(request.prompt)
+        if canned_response:
+            return canned_response
+        
         # Use DeepSeek for suggestions if available
         if llm_agent:
             logger.info("Using DeepSeek for AI-powered suggestions")
@@ -183,16 +222,39 @@ async def suggest_movies_stream(request: SuggestionRequest):
         
         async def generate_enriched_stream():
             """Generate streaming response with poster enrichment"""
+            poster_tasks = {}
             try:
+                # Plain greetings, help requests and blank input need no LLM call
+                canned_response = _get_canned_suggestions(request.prompt)
+                if canned_response:
+                    yield f"data: {json.dumps({'final_result': canned_response.model_dump()})}\n\n"
+                    yield f"data: {json.dumps({'complete': True, 'poster_count': 0})}\n\n"
+                    return
+                
                 # Step 1: Stream the raw AI response while collecting it
                 logger.info("🎬 Streaming AI response...")
                 yield f"data: {json.dumps({'status': 'Generating AI suggestions...'})}\n\n"
                 
                 collected_content = ""
-                async for chunk in llm_agent.generate_suggestions_stream(request.prompt):
+                stream_parser = SuggestionStreamParser()
+                async for chunk in llm_agent.generate_suggestions_stream(
+                    request.prompt, model_tier=_select_model_tier(request.prompt)
+                ):
                     # Stream the raw content to user
                     yield f"data: {json.dumps({'chunk': chunk})}\n\n"
                     collected_content += chunk
+                    
+                    # Emit each suggestion as soon as its JSON object is complete
+                    # and start its poster lookup while the model keeps generating
+                    for streamed in stream_parser.feed(chunk):
+                        yield f"data: {json.dumps({'suggestion': streamed})}\n\n"
+                        
+                        streamed_title = streamed["title"]
+                        if (poster_service and streamed_title not in poster_tasks
+                                and streamed_title not in ["Chat Response", "Help Response"]):
+                            poster_tasks[streamed_title] = asyncio.create_task(
+                                poster_service.get_poster_data(streamed_title)
+                            )
                 
                 # Step 2: Parse the complete AI response
                 logger.info("🎨 Parsing AI response and fetching posters...")
@@ -228,7 +290,11 @@ async def suggest_movies_stream(request: SuggestionRequest):
                 # Step 4: Fetch posters concurrently
                 if movie_titles_for_posters and poster_service:
                     try:
-                        poster_data = await poster_service.get_multiple_posters(movie_titles_for_posters)
+                        # Titles seen mid-stream already have a lookup in flight
+                        missing_titles = [t for t in movie_titles_for_posters if t not in poster_tasks]
+                        poster_data = await poster_service.get_multiple_posters(missing_titles) if missing_titles else {}
+                        for poster_title, poster_task in poster_tasks.items():
+                            poster_data[poster_title] = await poster_task
                         
                         # Update suggestions with poster data
                         for suggestion in suggestions:
@@ -287,6 +353,11 @@ async def suggest_movies_stream(request: SuggestionRequest):
                 logger.error(f"Error in enriched streaming: {e}")
                 error_response = json.dumps({'error': str(e), 'fallback': True})
                 yield f"data: {error_response}\n\n"
+            finally:
+                # A client disconnect or an early return must not leave lookups running
+                for poster_task in poster_tasks.values():
+                    if not poster_task.done():
+                        poster_task.cancel()
         
         return StreamingResponse(
             generate_enriched_stream(),
@@ -304,11 +375,73 @@ async def suggest_movies_stream(request: SuggestionRequest):
         logger.error(f"Error setting up enriched streaming: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Unable to start streaming suggestions")
 
+def _select_model_tier(prompt: str) -> str:
+    """Pick the LLM tier for a prompt, using the large model if routing is unavailable"""
+    if not suggestion_engine:
+        return "large"
+    return suggestion_engine.select_model(suggestion_engine.extract_user_preferences(prompt))
+
+def _get_canned_suggestions(prompt: str) -> Optional[SuggestionResponse]:
+    """Build the canned reply for plain greetings, help requests and blank input, if any"""
+    canned_response = suggestion_engine.get_canned_response(prompt) if suggestion_engine else None
+    if not canned_response:
+        return None
+    
+    logger.info("Answering conversational input with a canned response")
+    return SuggestionResponse(suggestions=[
+        MovieSuggestion(
+            title=response["title"],
+            genre=["conversation"],
+            year=datetime.now().year,
+            reason=response["reason"],
+            description="AI conversational response",
+            content_type="chat"
+        )
+        for response in canned_response
+    ])
+
+def _get_cached_suggestions(prompt: str) -> Optional[SuggestionResponse]:
+    """Return an unexpired cached response for a prompt, if any"""
+    cache_key = " ".join(prompt.lower().split())
+    entry = suggestion_cache.get(cache_key)
+    if entry is None:
+        return None
+    
+    expires_at, response = entry
+    if expires_at <= time.monotonic():
+        del suggestion_cache[cache_key]
+        return None
+    
+    suggestion_cache.move_to_end(cache_key)
+    return response.model_copy(deep=True)
+
+def _cache_suggestions(prompt: str, response: SuggestionResponse) -> None:
+    """Cache a poster-enriched response, evicting the least recently used entry
+    
+    Responses missing a poster are kept only briefly so a failed lookup is retried soon.
+    """
+    cache_key = " ".join(prompt.lower().split())
+    posters_complete = all(
+        suggestion.poster_url for suggestion in response.suggestions if suggestion.content_type != "chat"
+    )
+    ttl = SUGGESTION_CACHE_TTL if posters_complete else SUGGESTION_CACHE_PARTIAL_TTL
+    suggestion_cache[cache_key] = (time.monotonic() + ttl, response.model_copy(deep=True))
+    suggestion_cache.move_to_end(cache_key)
+    if len(suggestion_cache) > SUGGESTION_CACHE_SIZE:
+        suggestion_cache.popitem(last=False)
+
 async def _deepseek_suggestions(request: SuggestionRequest) -> SuggestionResponse:
     """Generate suggestions using DeepSeek via OpenRouter with poster enrichment"""
+    cached_response = _get_cached_suggestions(request.prompt)
+    if cached_response:
+        logger.info("Serving poster-enriched suggestions from response cache")
+        return cached_response
+    
     try:
         # Get AI suggestions from DeepSeek
-        ai_suggestions = await llm_agent.generate_suggestions(request.prompt)
+        ai_suggestions = await llm_agent.generate_suggestions(
+            request.prompt, model_tier=_select_model_tier(request.prompt)
+        )
         
         suggestions = []
         movie_titles_for_posters = []
@@ -387,7 +520,12 @@ async def _deepseek_suggestions(request: SuggestionRequest) -> SuggestionRespons
             return await _basic_suggestions(request)
         
         logger.info(f"Generated {len(suggestions)} DeepSeek-powered suggestions (with poster enrichment)")
-        return SuggestionResponse(suggestions=suggestions)
+        response = SuggestionResponse(suggestions=suggestions)
+        
+        # Only real LLM answers are cached by the agent; fallback lists never are
+        if llm_agent.has_cached_response(request.prompt):
+            _cache_suggestions(request.prompt, response)
+        return response
         
     except Exception as e:
         logger.error(f"Error in DeepSeek suggestions: {e}")
@@ -449,74 +587,69 @@ async def _basic_suggestions(request: SuggestionRequest) -> SuggestionResponse:
         logger.error(f"Error in basic suggestions: {e}")
         return await _emergency_fallback(request)
 
+# Emergency fallback suggestions, validated once at import and copied per request
+EMERGENCY_FALLBACK_SUGGESTIONS = (
+    MovieSuggestion(
+        title="The Shawshank Redemption",
+        genre=["drama"],
+        year=1994,
+        reason="A timeless classic that appeals to most viewers.",
+        description="Emergency fallback recommendation",
+        content_type="movie"
+    ),
+    MovieSuggestion(
+        title="Inception",
+        genre=["sci-fi", "thriller"],
+        year=2010,
+        reason="A mind-bending thriller with universal appeal and excellent storytelling.",
+        description="Emergency fallback recommendation",
+        content_type="movie"
+    ),
+    MovieSuggestion(
+        title="Spirited Away",
+        genre=["animation", "fantasy"],
+        year=2001,
+        reason="A beautiful animated film perfect for all ages with incredible artistry.",
+        description="Emergency fallback recommendation",
+        content_type="movie"
+    )
+)
+
+# Poster data for the fixed fallback titles, fetched once successfully and reused
+emergency_poster_data: Dict[str, Dict] = {}
+
 async def _emergency_fallback(request: SuggestionRequest) -> SuggestionResponse:
     """Emergency fallback when all systems fail - with some poster attempts"""
     logger.warning("Using emergency fallback suggestions")
     
-    # Create fallback suggestions with well-known movies
-    fallback_data = [
-        {
-            "title": "The Shawshank Redemption",
-            "genre": ["drama"],
-            "year": 1994,
-            "reason": f"A timeless classic that appeals to most viewers. Based on your request: '{request.prompt}'",
-            "description": "Emergency fallback recommendation"
-        },
-        {
-            "title": "Inception",
-            "genre": ["sci-fi", "thriller"],
-            "year": 2010,
-            "reason": "A mind-bending thriller with universal appeal and excellent storytelling.",
-            "description": "Emergency fallback recommendation"
-        },
-        {
-            "title": "Spirited Away",
-            "genre": ["animation", "fantasy"],
-            "year": 2001,
-            "reason": "A beautiful animated film perfect for all ages with incredible artistry.",
-            "description": "Emergency fallback recommendation"
-        }
-    ]
-    
-    fallback_suggestions = []
-    titles_for_posters = []
-    
-    # Create suggestions
-    for data in fallback_data:
-        suggestion = MovieSuggestion(
-            title=data["title"],
-            genre=data["genre"],
-            year=data["year"],
-            reason=data["reason"],
-            description=data["description"],
-            content_type="movie"
-        )
-        fallback_suggestions.append(suggestion)
-        titles_for_posters.append(data["title"])
+    fallback_suggestions = [suggestion.model_copy() for suggestion in EMERGENCY_FALLBACK_SUGGESTIONS]
+    fallback_suggestions[0].reason += f" Based on your request: '{request.prompt}'"
     
     # Try to get posters even for emergency fallback
-    if poster_service:
+    missing_titles = [s.title for s in fallback_suggestions if s.title not in emergency_poster_data]
+    if poster_service and missing_titles:
         try:
             logger.info("Attempting to fetch posters for emergency fallback suggestions")
-            poster_data = await poster_service.get_multiple_posters(titles_for_posters)
-            
-            for suggestion in fallback_suggestions:
-                if suggestion.title in poster_data and poster_data[suggestion.title]:
-                    poster_info = poster_data[suggestion.title]
-                    
-                    suggestion.poster_url = poster_info.get("poster_url")
-                    suggestion.imdb_id = poster_info.get("imdb_id")
-                    suggestion.imdb_rating = poster_info.get("rating")
-                    suggestion.imdb_title = poster_info.get("imdb_title")
-                    
-                    if suggestion.poster_url:
-                        suggestion.description = f"Emergency fallback with poster (Rating: {suggestion.imdb_rating or 'N/A'})"
-            
-            logger.info(f"Emergency fallback: Got posters for {len([s for s in fallback_suggestions if s.poster_url])} suggestions")
+            poster_data = await poster_service.get_multiple_posters(missing_titles)
+            emergency_poster_data.update(
+                (title, poster_info) for title, poster_info in poster_data.items() if poster_info
+            )
             
         except Exception as e:
             logger.error(f"Failed to fetch posters for emergency fallback: {e}")
     
+    for suggestion in fallback_suggestions:
+        poster_info = emergency_poster_data.get(suggestion.title)
+        if poster_info:
+            suggestion.poster_url = poster_info.get("poster_url")
+            suggestion.imdb_id = poster_info.get("imdb_id")
+            suggestion.imdb_rating = poster_info.get("rating")
+            suggestion.imdb_title = poster_info.get("imdb_title")
+            
+            if suggestion.poster_url:
+                suggestion.description = f"Emergency fallback with poster (Rating: {suggestion.imdb_rating or 'N/A'})"
+    
+    logger.info(f"Emergency fallback: Got posters for {len([s for s in fallback_suggestions if s.poster_url])} suggestions")
     return SuggestionResponse(suggestions=fallback_suggestions)
 
 @app.exception_handler(Exception)
@@ -540,6 +673,8 @@ async def shutdown_event():
         if poster_service:
             await poster_service.close()
             logger.info("Poster service closed successfully")
+        if llm_agent:
+            await llm_agent.close()
     except Exception as e:
         logger.error(f"Error during shutdown cleanup: {e}")
 
@@ -24,6 +24,24 @@ MAX_LANG_CODE_LENGTH = 5
 REASONABLE_YEAR_MIN = 1800
 REASONABLE_YEAR_MAX = 2030
 
+# LLM Agent Configuration
+LLM_RESPONSE_CACHE_SIZE = 256
+LLM_RESPONSE_CACHE_TTL = 3600  # Seconds; same as SUGGESTION_CACHE_TTL so content refreshes with the /suggest cache
+
+# LLM Model Routing
+LLM_LARGE_MODEL = "deepseek/deepseek-r1:free"
+LLM_SMALL_MODEL = "deepseek/deepseek-chat-v3-0324:free"
+SMALL_MODEL_MAX_WORDS = 12  # Longer prompts go to the large reasoning model
+
+# Suggestion Response Cache (final, poster-enriched /suggest responses)
+SUGGESTION_CACHE_SIZE = 256
+SUGGESTION_CACHE_TTL = 3600  # Seconds; poster and rating data can change
+SUGGESTION_CACHE_PARTIAL_TTL = 60  # Seconds; retry soon when a poster lookup came back empty
+
+# Poster Service Configuration
+MAX_CONCURRENT_POSTER_REQUESTS = 8  # Warm keep-alive connections, enough for one suggestion batch
+POSTER_MAX_CONNECTIONS = 100  # httpx's default; concurrent /suggest requests must not queue on the pool
+
 # Emergency Fallback Movies - REMOVED: Using AI-based fallbacks instead
 # This ensures the system uses AI recommendations even in emergency scenarios
 AI_FALLBACK_ENABLED = True
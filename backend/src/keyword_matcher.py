@@ -0,0 +1,50 @@
+"""
+Keyword Matcher - Single-pass multi-keyword detection for prompt understanding
+"""
+import re
+from typing import Dict, FrozenSet, Hashable, Iterable, Set
+
+
+class KeywordMatcher:
+    """Detect which keyword categories occur in a text with one compiled regex scan
+
+    Matching follows plain substring semantics (``keyword in text``) for every
+    keyword, including keywords that overlap or share a prefix.
+    """
+
+    def __init__(self, keyword_map: Dict[Hashable, Iterable[str]]):
+        """Compile the matcher from a mapping of category to keywords"""
+        keyword_categories: Dict[str, Set[Hashable]] = {}
+        for category, keywords in keyword_map.items():
+            for keyword in keywords:
+                keyword_categories.setdefault(keyword, set()).add(category)
+
+        # The regex reports only the longest keyword starting at each position,
+        # so fold in the categories of every shorter keyword that prefixes it
+        self._categories: Dict[str, FrozenSet[Hashable]] = {
+            keyword: frozenset(
+                category
+                for other, categories in keyword_categories.items()
+                if keyword.startswith(other)
+                for category in categories
+            )
+            for keyword in keyword_categories
+        }
+
+        # Zero-width lookahead finds matches starting at every position
+        alternation = "|".join(
+            re.escape(keyword)
+            for keyword in sorted(keyword_categories, key=len, reverse=True)
+        )
+        self._pattern = re.compile(f"(?=({alternation}))") if alternation else None
+
+    def match(self, text_lower: str) -> Set[Hashable]:
+        """Return every category with at least one keyword in the lowercased text"""
+        if self._pattern is None:
+            return set()
+
+        categories = self._categories
+        found: Set[Hashable] = set()
+        for keyword in set(self._pattern.findall(text_lower)):
+            found.update(categories[keyword])
+        return found
@@ -3,13 +3,93 @@ LLM Agent - OpenRouter integration with DeepSeek for intelligent movie suggestio
 """
 import os
 import json
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
 import httpx
 from openai import AsyncOpenAI
 
+from src.constants import (
+    LLM_RESPONSE_CACHE_SIZE, LLM_RESPONSE_CACHE_TTL, LLM_LARGE_MODEL, LLM_SMALL_MODEL
+)
+
 logger = logging.getLogger(__name__)
 
+class SuggestionStreamParser:
+    """Incrementally extract complete suggestion objects from a streamed JSON array"""
+    
+    def __init__(self):
+        """Initialize an empty parser"""
+        self._buffer = ""
+        self._position = 0
+        self._depth = 0
+        self._object_start = -1
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, chunk: str) -> List[Dict[str, str]]:
+        """
+        Consume a streamed chunk and return the suggestions it completed
+        
+        Args:
+            chunk: Next piece of raw model output
+            
+        Returns:
+            Suggestions whose closing brace arrived in this chunk
+        """
+        self._buffer += chunk
+        completed = []
+        
+        for index in range(self._position, len(self._buffer)):
+            char = self._buffer[index]
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = self._depth > 0
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = index
+                self._depth += 1
+            elif char == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    suggestion = self._parse_object(self._buffer[self._object_start:index + 1])
+                    if suggestion:
+                        completed.append(suggestion)
+        
+        # Drop consumed text so the buffer only holds the open object
+        if self._depth > 0:
+            self._buffer = self._buffer[self._object_start:]
+            self._object_start = 0
+        else:
+            self._buffer = ""
+        self._position = len(self._buffer)
+        
+        return completed
+    
+    @staticmethod
+    def _parse_object(text: str) -> Optional[Dict[str, str]]:
+        """Parse one JSON object, keeping it only if it is a valid suggestion"""
+        try:
+            suggestion = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        
+        if isinstance(suggestion, dict) and 'title' in suggestion and 'reason' in suggestion:
+            return {
+                'title': str(suggestion['title']),
+                'reason': str(suggestion['reason'])
+            }
+        return None
+
 class LLMAgent:
     """Agent responsible for generating intelligent movie suggestions using DeepSeek via OpenRouter"""
     
@@ -26,17 +106,28 @@ class LLMAgent:
         )
         
         # Model configuration
-        self.model = "deepseek/deepseek-r1:free"
+        self.model = os.getenv("OPENROUTER_LARGE_MODEL", LLM_LARGE_MODEL)
+        self.small_model = os.getenv("OPENROUTER_SMALL_MODEL", LLM_SMALL_MODEL)
+        self.model_tiers = {"small": self.small_model, "large": self.model}
         self.temperature = 0.7
         self.max_tokens = 1500
         
         # Initialize httpx client for streaming (better SSE handling)
         self.http_client = httpx.AsyncClient(timeout=30.0)
         
+        # TTL + LRU cache of parsed suggestions keyed by normalized prompt. The
+        # prompt carries its own language, so no separate language key is needed.
+        self._response_cache: "OrderedDict[str, Tuple[float, List[Dict[str, str]]]]" = OrderedDict()
+        
+        # Completions in progress keyed by normalized prompt, so identical
+        # concurrent requests wait on one call instead of each starting their own
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        
     async def generate_suggestions(
         self, 
         user_prompt: str, 
-        search_context: Optional[List[Dict[str, Any]]] = None
+        search_context: Optional[List[Dict[str, Any]]] = None,
+        model_tier: str = "large"
     ) -> List[Dict[str, str]]:
         """
         Generate intelligent movie suggestions using DeepSeek
@@ -44,19 +135,46 @@ class LLMAgent:
         Args:
             user_prompt: User's movie preference request
             search_context: Optional search results (currently not used)
+            model_tier: "small" for simple requests, "large" for complex ones
             
         Returns:
             List of movie suggestions with title and reason
         """
+        cache_key = self._normalize_prompt(user_prompt)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        task = self._in_flight.get(cache_key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._complete_suggestions(user_prompt, cache_key, model_tier))
+            self._in_flight[cache_key] = task
+            task.add_done_callback(lambda done: self._release_in_flight(cache_key, done))
+        else:
+            logger.info("Joining an in-flight completion for the same prompt")
+        
+        # Shielded so one caller going away does not cancel the call for the others
+        suggestions = await asyncio.shield(task)
+        return [dict(suggestion) for suggestion in suggestions]
+    
+    def _release_in_flight(self, cache_key: str, task: asyncio.Task) -> None:
+        """Forget a finished completion unless a newer one has taken its key"""
+        if self._in_flight.get(cache_key) is task:
+            del self._in_flight[cache_key]
+    
+    async def _complete_suggestions(self, user_prompt: str, cache_key: str, model_tier: str) -> List[Dict[str, str]]:
+        """Run one completion for a prompt and cache the parsed suggestions"""
         try:
             # Create simple, effective prompt
             system_prompt = self._build_simple_prompt()
             
-            logger.info(f"Generating suggestions with DeepSeek model: {self.model}")
+            model = self._resolve_model(model_tier)
+            logger.info(f"Generating suggestions with DeepSeek model: {model}")
             
             # Generate content using DeepSeek via OpenRouter
             response = await self.client.chat.completions.create(
-                model=self.model,
+                model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
@@ -70,6 +188,9 @@ class LLMAgent:
             content = response.choices[0].message.content
             suggestions = self._parse_suggestions(content)
             
+            if suggestions:
+                self._cache_response(cache_key, suggestions)
+            
             logger.info(f"Generated {len(suggestions)} suggestions successfully")
             return suggestions
             
@@ -80,7 +201,8 @@ class LLMAgent:
     async def generate_suggestions_stream(
         self, 
         user_prompt: str, 
-        search_context: Optional[List[Dict[str, Any]]] = None
+        search_context: Optional[List[Dict[str, Any]]] = None,
+        model_tier: str = "large"
     ) -> AsyncGenerator[str, None]:
         """
         Generate streaming movie suggestions using DeepSeek with proper SSE handling
@@ -88,6 +210,7 @@ class LLMAgent:
         Args:
             user_prompt: User's movie preference request
             search_context: Optional search results (currently not used)
+            model_tier: "small" for simple requests, "large" for complex ones
             
         Yields:
             Streaming response chunks
@@ -96,11 +219,12 @@ class LLMAgent:
             # Create simple, effective prompt
             system_prompt = self._build_simple_prompt()
             
-            logger.info(f"Starting streaming suggestions with DeepSeek model: {self.model}")
+            model = self._resolve_model(model_tier)
+            logger.info(f"Starting streaming suggestions with DeepSeek model: {model}")
             
             # Prepare request payload
             payload = {
-                "model": self.model,
+                "model": model,
                 "messages": [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
@@ -162,6 +286,45 @@ class LLMAgent:
             fallback_content = json.dumps(self._get_fallback_suggestions(user_prompt), indent=2)
             yield fallback_content
     
+    def _resolve_model(self, model_tier: str) -> str:
+        """Map a routing tier to its OpenRouter model, defaulting to the large model"""
+        return self.model_tiers.get(model_tier, self.model)
+    
+    @staticmethod
+    def _normalize_prompt(user_prompt: str) -> str:
+        """Normalize a prompt for cache lookups (case and whitespace insensitive)"""
+        return " ".join(user_prompt.lower().split())
+    
+    def has_cached_response(self, user_prompt: str) -> bool:
+        """Check whether a prompt has an unexpired, successfully parsed LLM response"""
+        entry = self._response_cache.get(self._normalize_prompt(user_prompt))
+        return entry is not None and entry[0] > time.monotonic()
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[List[Dict[str, str]]]:
+        """Return a copy of unexpired cached suggestions, marking the entry as recently used"""
+        entry = self._response_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        expires_at, cached = entry
+        if expires_at <= time.monotonic():
+            del self._response_cache[cache_key]
+            return None
+        
+        self._response_cache.move_to_end(cache_key)
+        logger.info("Serving suggestions from response cache")
+        return [dict(suggestion) for suggestion in cached]
+    
+    def _cache_response(self, cache_key: str, suggestions: List[Dict[str, str]]) -> None:
+        """Store parsed suggestions for LLM_RESPONSE_CACHE_TTL, evicting the least recently used entry"""
+        self._response_cache[cache_key] = (
+            time.monotonic() + LLM_RESPONSE_CACHE_TTL,
+            [dict(suggestion) for suggestion in suggestions]
+        )
+        self._response_cache.move_to_end(cache_key)
+        if len(self._response_cache) > LLM_RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
     def _build_simple_prompt(self) -> str:
         """Build simple, effective system prompt for movie recommendations"""
         return """You are a movie and TV show recommendation expert. When users ask for suggestions, provide 3-4 specific recommendations in JSON format.
@@ -1,11 +1,12 @@
 """
 Content Database - AI-based movie and TV series recommendation system
 """
-from typing import List, Dict, Any, Optional
+import sys
+from typing import List, Dict, Any, Optional, Iterable
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Content:
     """Unified content structure for both movies and TV series"""
     title: str
@@ -25,6 +26,13 @@ class Content:
     poster_url: Optional[str] = None
     rating: Optional[float] = None
     runtime: Optional[int] = None  # Minutes per episode/movie
+    
+    def __post_init__(self):
+        """Intern repeated tokens so identical genres share one string object"""
+        self.genre = [sys.intern(genre) for genre in self.genre]
+        self.content_type = sys.intern(self.content_type)
+        if self.director:
+            self.director = sys.intern(self.director)
 
 
 # Backward compatibility alias
@@ -114,11 +122,11 @@ class AIContentDatabase:
         """Get only TV series (empty - use AI recommendations instead)"""
         return []
     
-    def get_content_by_genre(self, genres: List[str], content_preference: str = "mixed") -> List[Content]:
+    def get_content_by_genre(self, genres: Iterable[str], content_preference: str = "mixed") -> List[Content]:
         """Get content by genre (empty - use AI recommendations instead)"""
         return []
     
-    def get_movies_by_genre(self, genres: List[str]) -> List[Content]:
+    def get_movies_by_genre(self, genres: Iterable[str]) -> List[Content]:
         """Get movies by genre (empty - use AI recommendations instead)"""
         return []
     
@@ -3,10 +3,14 @@ Poster Service - Simple movie/series poster fetching using IMDB API
 """
 import os
 import logging
+import functools
 from typing import Dict, Any, Optional
 import httpx
+import orjson
 import asyncio
 
+from src.constants import MAX_CONCURRENT_POSTER_REQUESTS, POSTER_MAX_CONNECTIONS
+
 logger = logging.getLogger(__name__)
 
 class PosterService:
@@ -16,11 +20,21 @@ class PosterService:
         """Initialize poster service"""
         self.base_url = "https://api.imdbapi.dev/search/titles"
         
-        # Configure HTTP client with timeout
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(8.0),
-            limits=httpx.Limits(max_keepalive_connections=3)
+        # Configure HTTP client with timeout. The search API has no batch
+        # endpoint, so a batch of titles is fetched concurrently; keep enough
+        # connections alive that a whole batch reuses warm TLS connections.
+        # The total cap stays high so concurrent requests don't queue on the pool.
+        self._timeout = httpx.Timeout(8.0)
+        self._limits = httpx.Limits(
+            max_keepalive_connections=MAX_CONCURRENT_POSTER_REQUESTS,
+            max_connections=POSTER_MAX_CONNECTIONS
         )
+        self.client = httpx.AsyncClient(timeout=self._timeout, limits=self._limits)
+    
+    @functools.cached_property
+    def sync_client(self) -> httpx.Client:
+        """Blocking client for callers outside an event loop, opened on first use since the app never needs it"""
+        return httpx.Client(timeout=self._timeout, limits=self._limits)
         
     async def get_poster_data(self, title: str) -> Optional[Dict[str, Any]]:
         """
@@ -33,46 +47,74 @@ class PosterService:
             Dictionary with poster_url, rating, year, type, etc. or None if not found
         """
         try:
-            # Clean the title for better search results
-            search_title = self._clean_title(title)
-            
-            # Make API request
-            params = {
-                "query": search_title,
-                "limit": 1
-            }
-            
-            logger.info(f"Searching for poster: {search_title}")
+            params = self._build_search_params(title)
             
             response = await self.client.get(self.base_url, params=params)
             response.raise_for_status()
             
-            data = response.json()
-            titles = data.get("titles", [])
-            
-            if titles and len(titles) > 0:
-                title_data = titles[0]
-                
-                # Extract poster and metadata
-                poster_info = {
-                    "poster_url": self._extract_poster_url(title_data),
-                    "imdb_id": title_data.get("id", ""),
-                    "year": title_data.get("startYear"),
-                    "rating": self._extract_rating(title_data),
-                    "type": title_data.get("type", "movie"),
-                    "imdb_title": title_data.get("primaryTitle", title)
-                }
-                
-                logger.info(f"Found poster for '{title}': {poster_info.get('poster_url', 'No URL')}")
-                return poster_info
-            
-            logger.warning(f"No poster found for title: {title}")
+            return self._parse_poster_response(orjson.loads(response.content), title)
+            
+        except Exception as e:
+            logger.error(f"Error fetching poster for '{title}': {e}")
             return None
+    
+    def get_poster_data_sync(self, title: str) -> Optional[Dict[str, Any]]:
+        """
+        Get poster data without an event loop (for scripts and offline jobs)
+        
+        Args:
+            title: Movie or series title to search for
+            
+        Returns:
+            Dictionary with poster_url, rating, year, type, etc. or None if not found
+        """
+        try:
+            params = self._build_search_params(title)
+            
+            response = self.sync_client.get(self.base_url, params=params)
+            response.raise_for_status()
+            
+            return self._parse_poster_response(orjson.loads(response.content), title)
             
         except Exception as e:
             logger.error(f"Error fetching poster for '{title}': {e}")
             return None
     
+    def _build_search_params(self, title: str) -> Dict[str, Any]:
+        """Build IMDB search query parameters for a title"""
+        # Clean the title for better search results
+        search_title = self._clean_title(title)
+        
+        logger.info(f"Searching for poster: {search_title}")
+        
+        return {
+            "query": search_title,
+            "limit": 1
+        }
+    
+    def _parse_poster_response(self, data: Dict[str, Any], title: str) -> Optional[Dict[str, Any]]:
+        """Extract poster and metadata from an IMDB search response"""
+        titles = data.get("titles", [])
+        
+        if titles and len(titles) > 0:
+            title_data = titles[0]
+            
+            # Extract poster and metadata
+            poster_info = {
+                "poster_url": self._extract_poster_url(title_data),
+                "imdb_id": title_data.get("id", ""),
+                "year": title_data.get("startYear"),
+                "rating": self._extract_rating(title_data),
+                "type": title_data.get("type", "movie"),
+                "imdb_title": title_data.get("primaryTitle", title)
+            }
+            
+            logger.info(f"Found poster for '{title}': {poster_info.get('poster_url', 'No URL')}")
+            return poster_info
+        
+        logger.warning(f"No poster found for title: {title}")
+        return None
+    
     async def get_multiple_posters(self, titles: list[str]) -> Dict[str, Optional[Dict[str, Any]]]:
         """
         Get posters for multiple titles concurrently
@@ -84,22 +126,25 @@ class PosterService:
             Dictionary mapping title to poster data
         """
         try:
-            # Create concurrent tasks for all titles
-            tasks = [self.get_poster_data(title) for title in titles]
+            # Fetch each distinct title once, preserving request order
+            unique_titles = list(dict.fromkeys(titles))
+            
+            # Create concurrent tasks for all unique titles
+            tasks = [self.get_poster_data(title) for title in unique_titles]
             
             # Wait for all tasks to complete
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Map results back to titles
             poster_data = {}
-            for title, result in zip(titles, results):
+            for title, result in zip(unique_titles, results):
                 if isinstance(result, Exception):
                     logger.error(f"Error fetching poster for '{title}': {result}")
                     poster_data[title] = None
                 else:
                     poster_data[title] = result
             
-            logger.info(f"Fetched posters for {len([r for r in poster_data.values() if r])} out of {len(titles)} titles")
+            logger.info(f"Fetched posters for {len([r for r in poster_data.values() if r])} out of {len(unique_titles)} unique titles")
             return poster_data
             
         except Exception as e:
@@ -157,11 +202,18 @@ class PosterService:
             return None
     
     async def close(self):
-        """Close the HTTP client"""
+        """Close the HTTP clients"""
         try:
             await self.client.aclose()
         except Exception:
             pass
+        
+        # Only close the blocking client if something actually opened it
+        if "sync_client" in self.__dict__:
+            try:
+                self.sync_client.close()
+            except Exception:
+                pass
     
     def __del__(self):
         """Cleanup on deletion"""
@@ -1,21 +1,114 @@
 """
 Prompt Engine - LLM prompt construction and context injection
 """
+import re
+import functools
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+LANGUAGE_INSTRUCTIONS = {
+    "en": "LANGUAGE: Respond in English with clear, engaging explanations.",
+    "es": "IDIOMA: Responde en español con explicaciones claras y atractivas.",
+    "fr": "LANGUE: Répondez en français avec des explications claires et engageantes.",
+    "de": "SPRACHE: Antworten Sie auf Deutsch mit klaren, ansprechenden Erklärungen.",
+    "it": "LINGUA: Rispondi in italiano con spiegazioni chiare e coinvolgenti.",
+    "pt": "IDIOMA: Responda em português com explicações claras e envolventes.",
+    "ja": "言語：明確で魅力的な説明で日本語で回答してください。",
+    "ko": "언어: 명확하고 매력적인 설명으로 한국어로 답변하세요.",
+    "zh": "语言：用中文回答，提供清晰、引人入胜的解释。",
+    "ru": "ЯЗЫК: Отвечайте на русском языке с четкими, увлекательными объяснениями.",
+    "ar": "اللغة: أجب باللغة العربية مع تفسيرات واضحة وجذابة.",
+    "hi": "भाषा: स्पष्ट, आकर्षक स्पष्टीकरण के साथ हिंदी में उत्तर दें।"
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _language_instruction(target_language: str) -> str:
+    """Get language-specific instructions, defaulting to English"""
+    return LANGUAGE_INSTRUCTIONS.get(target_language, LANGUAGE_INSTRUCTIONS["en"])
+
+
+# Static instructions go first so the prompt prefix is byte-identical across
+# requests and stays eligible for the provider's prompt cache; everything
+# request-specific is appended after it.
+MOVIE_PROMPT_PREFIX = """You are an expert movie and TV series recommendation AI with deep knowledge of cinema and television from all eras and cultures. You are also a friendly conversational assistant.
+
+INSTRUCTIONS:
+1. CONVERSATION DETECTION: First determine if the USER INPUT below is a conversational input (greeting, help request, casual chat) or a movie/series request
+2. CONVERSATION HANDLING: If conversational, respond naturally and warmly, inviting them to describe their preferences
+3. MOVIE/SERIES RECOMMENDATIONS: If requesting recommendations, provide 3-4 personalized suggestions
+4. MIXED INPUTS: If combining greeting + request, acknowledge greeting briefly then focus on suggestions
+
+RESPONSE GUIDELINES:
+- For greetings/casual: Use {"title": "Chat Response", "reason": "Your warm conversational response"}
+- For help requests: Use {"title": "Help Response", "reason": "Explanation of your capabilities with examples"}
+- For movie/series requests: Use specific titles and compelling explanations
+- Always be warm, helpful, and engaging
+
+OUTPUT FORMAT:
+Return exactly in this JSON format:
+[
+  {"title": "Title", "reason": "Response or explanation..."},
+  {"title": "Another Title", "reason": "Another explanation..."}
+]
+
+IMPORTANT: Return ONLY the JSON array, no additional text or formatting.
+
+"""
+
+MOVIE_PROMPT_TEMPLATE = MOVIE_PROMPT_PREFIX.replace("{", "{{").replace("}", "}}") + """{language_instruction}
+
+{context_section}
+
+USER INPUT:
+{user_request}"""
+
+KNOWLEDGE_SOURCE_SECTION = """KNOWLEDGE SOURCE:
+Use your extensive built-in knowledge of movies and TV series. The system has determined that real-time search is not needed for this request, so rely on your training data for recommendations."""
+
+# Full prompt for the LLM-knowledge-only path, with the context slot pre-filled
+MOVIE_PROMPT_LLM_ONLY_TEMPLATE = MOVIE_PROMPT_TEMPLATE.replace(
+    "{context_section}", KNOWLEDGE_SOURCE_SECTION.replace("{", "{{").replace("}", "}}")
+)
+
+# Real-time context is sent as one compact line per movie to keep prompts short
+CONTEXT_MAX_MOVIES = 5
+CONTEXT_SUMMARY_MAX_CHARS = 150
+ISO_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+# Words showing a request already has movie context. Matching is by substring,
+# so plurals and phrases ("movies", "best movies") are covered by their stems.
+MOVIE_CONTEXT_KEYWORDS = frozenset({
+    "movie", "film", "cinema", "watch", "recommend", "suggestion", "best", "latest"
+})
+
+
+def has_movie_context(text: str) -> bool:
+    """Check whether text already mentions movies, shared by the query enhancers"""
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in MOVIE_CONTEXT_KEYWORDS)
+
+
+@functools.lru_cache(maxsize=512)
+def _enhance_search_query(user_request: str) -> str:
+    """Build the enhanced search query for a user request (pure, so cached)"""
+    if not has_movie_context(user_request):
+        return f"movie recommendations {user_request} films cinema reviews"
+    return f"{user_request} movie reviews film recommendations"
+
+
 class PromptEngine:
     """Engine responsible for constructing structured LLM prompts with search context"""
     
     def __init__(self):
         """Initialize PromptEngine"""
-        self.prompt_templates = {
-            "movie_recommendation": self._get_movie_recommendation_template(),
-            "system_instructions": self._get_system_instructions()
-        }
+        # Static prompt scaffold; only the three dynamic slots vary per request
+        self._prompt_template = MOVIE_PROMPT_TEMPLATE
+        self._prompt_llm_only = MOVIE_PROMPT_LLM_ONLY_TEMPLATE
     
     def construct_movie_prompt(
         self, 
@@ -34,46 +127,46 @@ class PromptEngine:
         Returns:
             Structured prompt for LLM with conversation intelligence
         """
+        if not search_context:
+            return self.construct_movie_prompt_llm_only(user_request, target_language)
+        
         try:
-            # Determine if we have real-time context or should use LLM knowledge
-            has_realtime_data = bool(search_context)
-            
             # Build context sections
             context_section = self._build_context_section(search_context)
             language_instruction = self._get_language_instruction(target_language)
             
             # Construct conversation-aware prompt
-            prompt = f"""You are an expert movie and TV series recommendation AI with deep knowledge of cinema and television from all eras and cultures. You are also a friendly conversational assistant.
-
-{language_instruction}
+            prompt = self._prompt_template.format_map({
+                "language_instruction": language_instruction,
+                "user_request": user_request,
+                "context_section": context_section
+            })
 
-USER INPUT:
-{user_request}
-
-{context_section}
-
-INSTRUCTIONS:
-1. CONVERSATION DETECTION: First determine if this is a conversational input (greeting, help request, casual chat) or a movie/series request
-2. CONVERSATION HANDLING: If conversational, respond naturally and warmly, inviting them to describe their preferences
-3. MOVIE/SERIES RECOMMENDATIONS: If requesting recommendations, provide 3-4 personalized suggestions
-4. MIXED INPUTS: If combining greeting + request, acknowledge greeting briefly then focus on suggestions
-
-RESPONSE GUIDELINES:
-- For greetings/casual: Use {{"title": "Chat Response", "reason": "Your warm conversational response"}}
-- For help requests: Use {{"title": "Help Response", "reason": "Explanation of your capabilities with examples"}}
-- For movie/series requests: Use specific titles and compelling explanations
-- Always be warm, helpful, and engaging
-
-OUTPUT FORMAT:
-Return exactly in this JSON format:
-[
-  {{"title": "Title", "reason": "Response or explanation..."}},
-  {{"title": "Another Title", "reason": "Another explanation..."}}
-]
-
-IMPORTANT: Return ONLY the JSON array, no additional text or formatting."""
-
-            logger.info(f"Constructed conversation-aware prompt for language: {target_language}, realtime_data: {has_realtime_data}")
+            logger.info(f"Constructed conversation-aware prompt for language: {target_language}, realtime_data: True")
+            return prompt
+            
+        except Exception as e:
+            logger.error(f"Error constructing prompt: {e}")
+            return self._get_fallback_prompt(user_request, target_language)
+    
+    def construct_movie_prompt_llm_only(self, user_request: str, target_language: str = "en") -> str:
+        """
+        Construct the movie prompt when no real-time search data is available
+        
+        Args:
+            user_request: Original user's request (movie preferences or conversational)
+            target_language: Target language for responses
+            
+        Returns:
+            Structured prompt for LLM relying on its built-in knowledge
+        """
+        try:
+            prompt = self._prompt_llm_only.format_map({
+                "language_instruction": self._get_language_instruction(target_language),
+                "user_request": user_request
+            })
+            
+            logger.info(f"Constructed conversation-aware prompt for language: {target_language}, realtime_data: False")
             return prompt
             
         except Exception as e:
@@ -83,42 +176,30 @@ IMPORTANT: Return ONLY the JSON array, no additional text or formatting."""
     def _build_context_section(self, search_context: List[Dict[str, Any]]) -> str:
         """Build context section for conversation-aware prompts"""
         if not search_context:
-            return """KNOWLEDGE SOURCE:
-Use your extensive built-in knowledge of movies and TV series. The system has determined that real-time search is not needed for this request, so rely on your training data for recommendations."""
+            return KNOWLEDGE_SOURCE_SECTION
         
-        context_text = "REAL-TIME MOVIE DATA:\n"
-        for i, movie in enumerate(search_context[:5], 1):
-            context_text += f"\n{i}. TITLE: {movie.get('title', 'Unknown')}\n"
-            context_text += f"   SUMMARY: {movie.get('summary', 'No summary available')[:300]}...\n"
+        lines = ["REAL-TIME MOVIE DATA:"]
+        for i, movie in enumerate(search_context[:CONTEXT_MAX_MOVIES], 1):
+            title = movie.get('title', 'Unknown')
+            summary = (movie.get('summary') or 'No summary available').strip()[:CONTEXT_SUMMARY_MAX_CHARS]
+            # published_date is when the source article appeared, not the release year,
+            # so it is labelled as such and only kept when it is a real ISO date
+            published = str(movie.get('published_date') or '')[:10]
             
-            if movie.get('published_date'):
-                context_text += f"   DATE: {movie['published_date']}\n"
-            if movie.get('score'):
-                context_text += f"   RELEVANCE: {movie['score']:.2f}\n"
-            if movie.get('url'):
-                context_text += f"   SOURCE: {movie['url']}\n"
-            context_text += "\n"
+            if ISO_DATE_PATTERN.fullmatch(published):
+                lines.append(f"{i}. {title} — {summary} (published {published})")
+            else:
+                lines.append(f"{i}. {title} — {summary}")
+            
+            # Score and source URL don't help the model, so they are only logged
+            logger.debug(f"Context movie {i}: score={movie.get('score')} url={movie.get('url')}")
         
-        context_text += "\nUSE this real-time data to ensure your recommendations are current and relevant."
-        return context_text
+        lines.append("USE this real-time data to ensure your recommendations are current and relevant.")
+        return "\n".join(lines)
     
     def _get_language_instruction(self, target_language: str) -> str:
         """Get language-specific instructions"""
-        instructions = {
-            "en": "LANGUAGE: Respond in English with clear, engaging explanations.",
-            "es": "IDIOMA: Responde en español con explicaciones claras y atractivas.",
-            "fr": "LANGUE: Répondez en français avec des explications claires et engageantes.",
-            "de": "SPRACHE: Antworten Sie auf Deutsch mit klaren, ansprechenden Erklärungen.",
-            "it": "LINGUA: Rispondi in italiano con spiegazioni chiare e coinvolgenti.",
-            "pt": "IDIOMA: Responda em português com explicações claras e envolventes.",
-            "ja": "言語：明確で魅力的な説明で日本語で回答してください。",
-            "ko": "언어: 명확하고 매력적인 설명으로 한국어로 답변하세요.",
-            "zh": "语言：用中文回答，提供清晰、引人入胜的解释。",
-            "ru": "ЯЗЫК: Отвечайте на русском языке с четкими, увлекательными объяснениями.",
-            "ar": "اللغة: أجب باللغة العربية مع تفسيرات واضحة وجذابة.",
-            "hi": "भाषा: स्पष्ट, आकर्षक स्पष्टीकरण के साथ हिंदी में उत्तर दें।"
-        }
-        return instructions.get(target_language, instructions["en"])
+        return _language_instruction(target_language)
     
     def construct_translation_prompt(self, text: str, source_lang: str, target_lang: str) -> str:
         """
@@ -168,30 +249,11 @@ LANGUAGE CODE:"""
         Returns:
             Enhanced search query
         """
-        movie_keywords = [
-            "movies", "films", "cinema", "movie", "film", 
-            "watch", "recommend", "suggestion", "best", "latest"
-        ]
-        
-        request_lower = user_request.lower()
-        has_movie_context = any(keyword in request_lower for keyword in movie_keywords)
-        
-        if not has_movie_context:
-            enhanced = f"movie recommendations {user_request} films cinema reviews"
-        else:
-            enhanced = f"{user_request} movie reviews film recommendations"
+        enhanced = _enhance_search_query(user_request)
         
         logger.info(f"Enhanced search query: {enhanced}")
         return enhanced
     
-    def _get_movie_recommendation_template(self) -> str:
-        """Get the base template for movie recommendations"""
-        return """Based on the user request and available movie data, provide personalized recommendations."""
-    
-    def _get_system_instructions(self) -> str:
-        """Get system instructions for the LLM"""
-        return """You are an expert movie recommendation system with knowledge of global cinema."""
-    
     def _get_fallback_prompt(self, user_request: str, target_language: str) -> str:
         """Provide fallback prompt if construction fails"""
         logger.warning("Using fallback prompt due to construction error")
@@ -212,12 +274,12 @@ Please provide 3 movie recommendations based on this request. Return your respon
         if not context:
             return "No context available"
         
-        summary = f"Context summary: {len(context)} items\n"
+        parts = [f"Context summary: {len(context)} items\n"]
         for i, item in enumerate(context[:3], 1):
             title = item.get('title', 'Unknown')[:50]
-            summary += f"{i}. {title}...\n"
+            parts.append(f"{i}. {title}...\n")
         
         if len(context) > 3:
-            summary += f"... and {len(context) - 3} more items"
+            parts.append(f"... and {len(context) - 3} more items")
         
-        return summary 
\ No newline at end of file
+        return "".join(parts) 
\ No newline at end of file
@@ -7,8 +7,46 @@ from typing import List, Dict, Any, Optional
 # from exa_py import Exa  # COMMENTED OUT - keeping for future implementation
 from datetime import datetime, timedelta
 
+from src.prompt_engine import has_movie_context
+
 logger = logging.getLogger(__name__)
 
+# Keywords for future reference when re-enabling Exa. Kept at module level so
+# SearchAgent instances do not each allocate their own copies.
+REALTIME_KEYWORDS = (
+    # Recent releases
+    "2024", "2023", "latest", "new release", "just released", "recently released",
+    "newest", "brand new", "came out", "just came out", "this year", "last year",
+
+    # Real-time availability
+    "currently streaming", "available now", "watch now", "streaming on",
+    "on netflix", "on disney+", "on hulu", "on amazon", "where to watch",
+
+    # Trending/current
+    "trending", "popular now", "box office", "currently popular", "hot right now",
+    "what's popular", "current hits", "today's", "this week", "this month",
+
+    # Obscure/niche that might need verification
+    "obscure", "indie", "independent", "arthouse", "foreign", "international",
+    "lesser known", "hidden gem", "underrated"
+)
+
+# Keywords that indicate LLM knowledge is sufficient
+KNOWLEDGE_BASE_KEYWORDS = (
+    # Classic/established
+    "classic", "old", "vintage", "retro", "timeless", "legendary", "iconic",
+    "80s", "90s", "1980s", "1990s", "2000s", "early 2000s",
+
+    # Popular/well-known
+    "popular", "famous", "well-known", "blockbuster", "mainstream", "hits",
+    "best of all time", "greatest", "top rated", "award winning",
+
+    # General genres (LLM has good knowledge)
+    "action movies", "comedy films", "romantic comedies", "horror movies", 
+    "sci-fi", "fantasy", "drama", "thriller", "animated", "disney", "pixar"
+)
+
+
 class SearchAgent:
     """Agent responsible for searching real-time movie data using Exa API (CURRENTLY DISABLED)"""
     
@@ -22,40 +60,6 @@ class SearchAgent:
         
         logger.info("SearchAgent initialized but Exa integration is disabled")
         
-        # Keywords for future reference when re-enabling Exa
-        self.realtime_keywords = [
-            # Recent releases
-            "2024", "2023", "latest", "new release", "just released", "recently released",
-            "newest", "brand new", "came out", "just came out", "this year", "last year",
-            
-            # Real-time availability
-            "currently streaming", "available now", "watch now", "streaming on",
-            "on netflix", "on disney+", "on hulu", "on amazon", "where to watch",
-            
-            # Trending/current
-            "trending", "popular now", "box office", "currently popular", "hot right now",
-            "what's popular", "current hits", "today's", "this week", "this month",
-            
-            # Obscure/niche that might need verification
-            "obscure", "indie", "independent", "arthouse", "foreign", "international",
-            "lesser known", "hidden gem", "underrated"
-        ]
-        
-        # Keywords that indicate LLM knowledge is sufficient
-        self.knowledge_base_keywords = [
-            # Classic/established
-            "classic", "old", "vintage", "retro", "timeless", "legendary", "iconic",
-            "80s", "90s", "1980s", "1990s", "2000s", "early 2000s",
-            
-            # Popular/well-known
-            "popular", "famous", "well-known", "blockbuster", "mainstream", "hits",
-            "best of all time", "greatest", "top rated", "award winning",
-            
-            # General genres (LLM has good knowledge)
-            "action movies", "comedy films", "romantic comedies", "horror movies", 
-            "sci-fi", "fantasy", "drama", "thriller", "animated", "disney", "pixar"
-        ]
-        
     def should_use_exa_search(self, user_prompt: str) -> bool:
         """
         Determine whether to use Exa API search or rely on LLM knowledge base
@@ -73,8 +77,8 @@ class SearchAgent:
         
         # COMMENTED OUT - Original logic for when Exa is re-enabled:
         # prompt_lower = user_prompt.lower()
-        # needs_realtime = any(keyword in prompt_lower for keyword in self.realtime_keywords)
-        # knowledge_sufficient = any(keyword in prompt_lower for keyword in self.knowledge_base_keywords)
+        # needs_realtime = any(keyword in prompt_lower for keyword in REALTIME_KEYWORDS)
+        # knowledge_sufficient = any(keyword in prompt_lower for keyword in KNOWLEDGE_BASE_KEYWORDS)
         # 
         # if needs_realtime:
         #     logger.info(f"Would use Exa search: detected real-time keywords in '{user_prompt[:50]}...'")
@@ -151,16 +155,8 @@ class SearchAgent:
     
     def _enhance_movie_query(self, user_prompt: str) -> str:
         """Enhance user prompt for better movie search results (for future Exa use)"""
-        movie_keywords = [
-            "movies", "films", "cinema", "movie recommendations",
-            "film suggestions", "best movies", "latest movies"
-        ]
-        
         # Add movie context if not already present
-        prompt_lower = user_prompt.lower()
-        has_movie_context = any(keyword in prompt_lower for keyword in movie_keywords)
-        
-        if not has_movie_context:
+        if not has_movie_context(user_prompt):
             enhanced_query = f"movie recommendations {user_prompt} films cinema"
         else:
             enhanced_query = user_prompt
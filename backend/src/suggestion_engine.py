@@ -2,21 +2,111 @@
 Movie Suggestion Engine - AI-based recommendation system
 """
 import re
+import functools
 import random
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Optional, FrozenSet
 from dataclasses import dataclass
 
 from src.movie_data import AIContentDatabase, Movie
+from src.keyword_matcher import KeywordMatcher
 from src.constants import (
     DEFAULT_MIN_SUGGESTIONS, DEFAULT_MAX_SUGGESTIONS, MAX_KEYWORD_SCORE,
     GENRE_SCORE_MULTIPLIER, FALLBACK_SCORE, EMERGENCY_FALLBACK_SCORE,
     RECENT_MOVIE_THRESHOLD_YEARS, MODERATE_RECENT_THRESHOLD_YEARS,
     RECENT_MOVIE_BONUS, MODERATE_RECENT_BONUS, AI_FALLBACK_ENABLED,
-    AI_FALLBACK_MIN_SUGGESTIONS, AI_FALLBACK_PROMPT
+    AI_FALLBACK_MIN_SUGGESTIONS, AI_FALLBACK_PROMPT, SMALL_MODEL_MAX_WORDS
 )
 
+# Keyword match categories used by the engine's single-pass prompt scan
+GENRE_MATCH = "genre"
+CONTENT_TYPE_MATCH = "content_type"
+CONTENT_REQUEST_MATCH = "content_request"
 
-@dataclass
+# Keywords that indicate a movie/series request rather than casual chat
+CONTENT_REQUEST_KEYWORDS = [
+    'movie', 'film', 'watch', 'recommend', 'suggest', 'series', 'show',
+    'tv', 'cinema', 'action', 'comedy', 'drama', 'horror', 'romance'
+]
+
+# Compound concepts and synonyms that imply genres beyond the keyword table
+SPECIAL_GENRE_KEYWORDS = {
+    'action': ('superhero', 'marvel', 'dc'),
+    'romance': ('rom-com', 'romantic comedy'),
+    'comedy': ('rom-com', 'romantic comedy', 'feel-good', 'uplifting'),
+    'thriller': ('psychological',),
+    'family': ('feel-good', 'uplifting')
+}
+
+# Conversational greetings, help requests and general questions, compiled once
+CONVERSATIONAL_PATTERN = re.compile(
+    r'^(?:'
+    # Greetings
+    r'(?:hi|hello|hey|hii|hai|hiya|howdy|sup)\.?$'
+    r'|(?:good morning|good afternoon|good evening)\.?$'
+    # Help requests
+    r'|help|what can you do|how do you work|what are you'
+    # General questions
+    r'|who are you|what is this|explain'
+    r')'
+)
+
+# Greetings and help questions that make up the whole message and get a canned
+# reply. Stricter than CONVERSATIONAL_PATTERN, which only steers model routing.
+# The named group tells which canned intent matched.
+CANNED_RESPONSE_PATTERN = re.compile(
+    r'^(?:'
+    # Greetings
+    r'(?P<greeting>(?:hi|hello|hey|hii|hai|hiya|howdy|sup'
+    r'|good morning|good afternoon|good evening)\.?$)'
+    # Help requests and general questions, only when they are the whole message
+    r'|(?P<help>(?:help|what can you do|how do you work|how does this work'
+    r'|what are you|what are your capabilities|who are you|what is this|explain)\W*$)'
+    r')'
+)
+
+# Precomputed replies for conversational intents that need no LLM call
+CANNED_RESPONSES = {
+    "greeting": [{
+        "title": "Chat Response",
+        "reason": "Hello! I'm your movie and TV series guide. Tell me what you're in the mood for - "
+                  "a genre, a favourite film, or just a vibe - and I'll recommend something great to watch."
+    }],
+    "help": [{
+        "title": "Help Response",
+        "reason": "I can recommend movies and TV series for any taste. Ask me for a genre, a mood, or "
+                  "titles like one you loved - for example 'funny animated movies for kids' or "
+                  "'sci-fi series like Black Mirror' - and I'll suggest 3-4 picks with reasons."
+    }]
+}
+
+
+def _build_keyword_matcher() -> KeywordMatcher:
+    """Compile one matcher covering every keyword family, so a prompt is scanned once"""
+    content_db = AIContentDatabase()
+    keyword_map = {
+        (CONTENT_REQUEST_MATCH, None): tuple(CONTENT_REQUEST_KEYWORDS)
+    }
+    for genre, keywords in content_db.get_genre_keywords().items():
+        keyword_map[(GENRE_MATCH, genre)] = tuple(keywords)
+    for genre, keywords in SPECIAL_GENRE_KEYWORDS.items():
+        keyword_map[(GENRE_MATCH, genre)] = keyword_map.get((GENRE_MATCH, genre), ()) + keywords
+    for content_type, keywords in content_db.get_content_type_keywords().items():
+        keyword_map[(CONTENT_TYPE_MATCH, content_type)] = tuple(keywords)
+    return KeywordMatcher(keyword_map)
+
+
+# Keyword tables are static, so they are frozen into a single matcher at import
+# and shared by every engine instance
+_KEYWORD_MATCHER = _build_keyword_matcher()
+
+
+@functools.lru_cache(maxsize=512)
+def _match_keywords(prompt_lower: str) -> FrozenSet[tuple]:
+    """Scan a lowercased prompt for every keyword family (pure, so cached for repeat prompts)"""
+    return frozenset(_KEYWORD_MATCHER.match(prompt_lower))
+
+
+@dataclass(slots=True)
 class SuggestionResult:
     """Result from suggestion algorithm with movie and reasoning"""
     movie: Movie
@@ -29,10 +119,14 @@ class AIMovieSuggestionEngine:
     
     def __init__(self, min_suggestions: int = DEFAULT_MIN_SUGGESTIONS, max_suggestions: int = DEFAULT_MAX_SUGGESTIONS):
         """Initialize AI-based suggestion engine"""
-        self.ai_content_db = AIContentDatabase()
         self.min_suggestions = min_suggestions
         self.max_suggestions = max_suggestions
-        
+    
+    @functools.cached_property
+    def ai_content_db(self) -> AIContentDatabase:
+        """Content database, created on first use since prompt scanning no longer needs it"""
+        return AIContentDatabase()
+    
     def suggest_movies(self, prompt: str, count: int = None) -> List[SuggestionResult]:
         """
         Generate AI-based movie/series suggestions
@@ -53,16 +147,18 @@ class AIMovieSuggestionEngine:
     
     def extract_user_preferences(self, prompt: str) -> Dict[str, Any]:
         """Extract user preferences for AI prompt construction"""
-        prompt_lower = prompt.lower()
+        # Lowercase once and scan the prompt once for every keyword family
+        prompt_lower = prompt.lower().strip()
+        matches = _match_keywords(prompt_lower)
         
         # Detect content type preference
-        content_preference = self.ai_content_db.detect_content_preference(prompt)
+        content_preference = self._detect_content_preference(matches)
         
         # Extract genre preferences using keyword mapping
-        detected_genres = self._extract_genres_from_prompt(prompt)
+        detected_genres = self._extract_genres_from_prompt(prompt, matches, prompt_lower)
         
         # Detect conversation vs movie request
-        is_conversational = self._is_conversational_input(prompt)
+        is_conversational = self._is_conversational_input(prompt, matches, prompt_lower)
         
         return {
             "content_preference": content_preference,
@@ -71,75 +167,70 @@ class AIMovieSuggestionEngine:
             "original_prompt": prompt
         }
     
-    def _extract_genres_from_prompt(self, prompt: str) -> Set[str]:
-        """Extract genre keywords from user prompt using AI content database"""
-        prompt_lower = prompt.lower()
-        detected_genres = set()
+    def select_model(self, preferences: Dict[str, Any]) -> str:
+        """
+        Route a request to the "small" or "large" LLM tier
         
-        genre_keywords = self.ai_content_db.get_genre_keywords()
+        Args:
+            preferences: Output of extract_user_preferences
+            
+        Returns:
+            "small" for chat or short single-genre requests, otherwise "large"
+        """
+        if preferences.get("is_conversational"):
+            return "small"
         
-        for genre, keywords in genre_keywords.items():
-            for keyword in keywords:
-                if keyword in prompt_lower:
-                    detected_genres.add(genre)
-                    break  # Don't double-count same genre
+        word_count = len(preferences.get("original_prompt", "").split())
+        if len(preferences.get("detected_genres", [])) <= 1 and word_count < SMALL_MODEL_MAX_WORDS:
+            return "small"
         
-        # Handle special cases and synonyms
-        detected_genres = self._handle_special_genre_cases(prompt_lower, detected_genres)
+        return "large"
+    
+    def _detect_content_preference(self, matches: FrozenSet[tuple]) -> str:
+        """Detect if user wants movies-only, series-only, or both from keyword matches"""
+        has_movie_keywords = (CONTENT_TYPE_MATCH, 'movie') in matches
+        has_series_keywords = (CONTENT_TYPE_MATCH, 'series') in matches
         
-        return detected_genres
+        if has_movie_keywords and not has_series_keywords:
+            return "movies_only"
+        elif has_series_keywords and not has_movie_keywords:
+            return "series_only"
+        else:
+            return "mixed"  # Both movies and series
     
-    def _handle_special_genre_cases(self, prompt_lower: str, genres: Set[str]) -> Set[str]:
-        """Handle special cases and synonyms in genre detection"""
-        # Handle compound concepts
-        if 'superhero' in prompt_lower or 'marvel' in prompt_lower or 'dc' in prompt_lower:
-            genres.add('action')
-            
-        if 'rom-com' in prompt_lower or 'romantic comedy' in prompt_lower:
-            genres.add('romance')
-            genres.add('comedy')
-            
-        if 'psychological' in prompt_lower:
-            genres.add('thriller')
-            
-        if 'feel-good' in prompt_lower or 'uplifting' in prompt_lower:
-            genres.add('comedy')
-            genres.add('family')
-            
-        return genres
+    def _extract_genres_from_prompt(
+        self,
+        prompt: str,
+        matches: Optional[FrozenSet[tuple]] = None,
+        prompt_lower: Optional[str] = None
+    ) -> FrozenSet[str]:
+        """Extract genre keywords from user prompt using AI content database"""
+        if prompt_lower is None:
+            prompt_lower = prompt.lower().strip()
+        if matches is None:
+            matches = _match_keywords(prompt_lower)
+        
+        # Special cases and synonyms are part of the same keyword scan
+        return frozenset(genre for kind, genre in matches if kind == GENRE_MATCH)
     
-    def _is_conversational_input(self, prompt: str) -> bool:
+    def _is_conversational_input(
+        self,
+        prompt: str,
+        matches: Optional[FrozenSet[tuple]] = None,
+        prompt_lower: Optional[str] = None
+    ) -> bool:
         """Detect if input is conversational rather than a movie request"""
-        prompt_lower = prompt.lower().strip()
-        
-        # Common conversational greetings and inputs
-        conversational_patterns = [
-            # Greetings
-            r'^(hi|hello|hey|hii|hai|hiya|howdy|sup)\.?$',
-            r'^(good morning|good afternoon|good evening)\.?$',
-            
-            # Help requests
-            r'^(help|what can you do|how do you work|what are you).*',
-            
-            # General questions
-            r'^(who are you|what is this|explain).*',
-            
-            # Single word greetings
-            r'^(hi|hello|hey|hii|hai)$'
-        ]
+        if prompt_lower is None:
+            prompt_lower = prompt.lower().strip()
         
         # Check for conversational patterns
-        for pattern in conversational_patterns:
-            if re.match(pattern, prompt_lower):
-                return True
+        if CONVERSATIONAL_PATTERN.match(prompt_lower):
+            return True
         
         # Check for movie/series keywords that indicate a request
-        content_keywords = [
-            'movie', 'film', 'watch', 'recommend', 'suggest', 'series', 'show',
-            'tv', 'cinema', 'action', 'comedy', 'drama', 'horror', 'romance'
-        ]
-        
-        has_content_keywords = any(keyword in prompt_lower for keyword in content_keywords)
+        if matches is None:
+            matches = _match_keywords(prompt_lower)
+        has_content_keywords = (CONTENT_REQUEST_MATCH, None) in matches
         
         # If it's a short message without content keywords, likely conversational
         if len(prompt.split()) <= 3 and not has_content_keywords:
@@ -147,6 +238,28 @@ class AIMovieSuggestionEngine:
             
         return False
     
+    def get_canned_response(self, prompt: str) -> Optional[List[Dict[str, str]]]:
+        """
+        Get a precomputed reply for plain greetings, help requests and empty input
+        
+        Args:
+            prompt: User's raw input
+            
+        Returns:
+            Canned suggestions in LLM response format, or None if the LLM is needed
+        """
+        prompt_lower = prompt.lower().strip()
+        
+        # Blank or punctuation-only input carries nothing for the LLM to act on
+        if not any(char.isalnum() for char in prompt_lower):
+            return [dict(response) for response in CANNED_RESPONSES["help"]]
+        
+        match = CANNED_RESPONSE_PATTERN.match(prompt_lower)
+        if not match:
+            return None
+        
+        return [dict(response) for response in CANNED_RESPONSES[match.lastgroup]]
+    
     def get_ai_fallback_prompt(self) -> str:
         """Get the AI fallback prompt for emergency scenarios"""
         if AI_FALLBACK_ENABLED:
@@ -0,0 +1,141 @@
+"""
+Shared test fixtures for Movie Suggester AI
+"""
+import json
+import zlib
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.movie_data import AIContentDatabase
+from src.suggestion_engine import MovieSuggestionEngine
+
+# Deterministic titles served by the fake LLM agent; each prompt gets its own slice
+FAKE_SUGGESTION_TITLES = (
+    "The Shawshank Redemption", "Spirited Away", "Parasite", "Inception",
+    "Coco", "Mad Max: Fury Road", "Amelie", "Get Out", "Arrival", "Paddington 2",
+    "The Grand Budapest Hotel", "Whiplash"
+)
+FAKE_SUGGESTION_COUNT = 3
+
+# The one fake title the fake poster service has no poster for
+FAKE_POSTERLESS_TITLE = "Amelie"
+
+# Deliberately free of the words the reply-quality regexes look for
+FAKE_REASON = "Placeholder reason from the fake LLM agent"
+
+
+class FakeLLMAgent:
+    """Stand-in for LLMAgent that answers instantly without network calls"""
+
+    def __init__(self):
+        """Record every prompt that reaches the agent, like a call spy"""
+        self.generated_prompts: List[str] = []
+
+    async def generate_suggestions(self, user_prompt: str, model_tier: str = "large") -> List[Dict[str, Any]]:
+        """Return a deterministic, prompt-dependent slice of the fake titles"""
+        self.generated_prompts.append(user_prompt)
+        start = zlib.crc32(user_prompt.encode()) % len(FAKE_SUGGESTION_TITLES)
+        titles = [
+            FAKE_SUGGESTION_TITLES[(start + offset) % len(FAKE_SUGGESTION_TITLES)]
+            for offset in range(FAKE_SUGGESTION_COUNT)
+        ]
+        return [{"title": title, "reason": FAKE_REASON} for title in titles]
+
+    async def generate_suggestions_stream(self, user_prompt: str, model_tier: str = "large") -> AsyncGenerator[str, None]:
+        """Stream the same suggestions as a JSON array in two chunks"""
+        content = json.dumps(await self.generate_suggestions(user_prompt, model_tier))
+        middle = len(content) // 2
+        yield content[:middle]
+        yield content[middle:]
+
+    def parse_suggestions(self, response_text: str) -> List[Dict[str, Any]]:
+        """Parse the JSON array produced by generate_suggestions_stream"""
+        return json.loads(response_text)
+
+    def has_cached_response(self, user_prompt: str) -> bool:
+        """Mirror LLMAgent: a prompt counts as cached once it has been answered"""
+        normalized = " ".join(user_prompt.lower().split())
+        return any(" ".join(prompt.lower().split()) == normalized for prompt in self.generated_prompts)
+
+    async def close(self):
+        """Nothing to release"""
+
+
+class FakePosterService:
+    """Stand-in for PosterService with IMDB data for every fake title but one"""
+
+    def __init__(self):
+        """Build deterministic poster data, leaving FAKE_POSTERLESS_TITLE without a poster"""
+        self.posters: Dict[str, Dict[str, Any]] = {
+            title: {
+                "poster_url": f"https://posters.example.com/{index}.jpg",
+                "imdb_id": f"tt{index:07d}",
+                "year": 2000 + index,
+                "rating": 7.5,
+                "type": "movie",
+                "imdb_title": title
+            }
+            for index, title in enumerate(FAKE_SUGGESTION_TITLES)
+            if title != FAKE_POSTERLESS_TITLE
+        }
+
+    async def get_poster_data(self, title: str) -> Optional[Dict[str, Any]]:
+        """Return the title's poster data, if it has any"""
+        return self.posters.get(title)
+
+    async def get_multiple_posters(self, titles: List[str]) -> Dict[str, Any]:
+        """Return poster data for every title that has some"""
+        return {title: self.posters[title] for title in titles if title in self.posters}
+
+    async def close(self):
+        """Nothing to release"""
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client shared by the whole session
+
+    Deliberately not entered as a context manager: the app's shutdown hook
+    closes the shared HTTP clients, and no startup work needs to run.
+    """
+    return TestClient(main.app)
+
+
+@pytest.fixture
+async def aclient():
+    """In-process async client so one test can fan out requests with asyncio.gather"""
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        yield async_client
+
+
+@pytest.fixture(scope="session")
+def content_db():
+    """Content database built once per test session"""
+    return AIContentDatabase()
+
+
+@pytest.fixture(scope="session")
+def engine(content_db):
+    """Suggestion engine shared by the session, wired to the shared content database"""
+    suggestion_engine = MovieSuggestionEngine()
+    suggestion_engine.ai_content_db = content_db
+    return suggestion_engine
+
+
+@pytest.fixture(autouse=True)
+def fake_backends(request, monkeypatch):
+    """Swap the LLM agent and poster service for fakes unless the test is marked integration"""
+    # Every test starts from an empty /suggest response cache
+    monkeypatch.setattr(main, "suggestion_cache", OrderedDict())
+
+    if request.node.get_closest_marker("integration"):
+        return
+
+    monkeypatch.setattr(main, "llm_agent", FakeLLMAgent())
+    monkeypatch.setattr(main, "poster_service", FakePosterService())
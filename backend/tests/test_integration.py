@@ -1,22 +1,24 @@
 """
 Integration tests for Movie Suggester AI API
 """
+import time
+import asyncio
+import statistics
 import pytest
-from fastapi.testclient import TestClient
-from main import app
+import main
+
+# Most common request payload; httpx only reads it, so one shared dict is safe
+ACTION_MOVIES_REQUEST = {"prompt": "action movies"}
+
 
 class TestMovieSuggesterIntegration:
     """Integration tests for the complete Movie Suggester API workflow"""
     
-    def setup_method(self):
-        """Set up test client"""
-        self.client = TestClient(app)
-    
-    def test_basic_suggestion_request(self):
+    def test_basic_suggestion_request(self, client):
         """Test basic suggestion request returns proper response"""
-        response = self.client.post(
+        response = client.post(
             "/suggest",
-            json={"prompt": "action movies"}
+            json=ACTION_MOVIES_REQUEST
         )
         
         assert response.status_code == 200
@@ -48,57 +50,50 @@ class TestMovieSuggesterIntegration:
             assert len(suggestion["reason"]) > 0
             assert len(suggestion["description"]) > 0
 
-    def test_different_genres_prompts(self):
+    @pytest.mark.parametrize("prompt", [
+        "action movies with explosions",
+        "romantic comedies",
+        "horror films",
+        "animated Disney movies",
+        "science fiction space opera"
+    ])
+    def test_different_genres_prompts(self, client, prompt):
         """Test that different genre prompts return appropriate suggestions"""
-        test_cases = [
-            "action movies with explosions",
-            "romantic comedies",
-            "horror films",
-            "animated Disney movies",
-            "science fiction space opera"
-        ]
+        response = client.post(
+            "/suggest",
+            json={"prompt": prompt}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["suggestions"]) >= 3
         
-        for prompt in test_cases:
-            response = self.client.post(
-                "/suggest",
-                json={"prompt": prompt}
-            )
-            assert response.status_code == 200
-            data = response.json()
-            assert len(data["suggestions"]) >= 3
-            
-            # Each suggestion should be valid
-            for suggestion in data["suggestions"]:
-                assert suggestion["title"]
-                assert suggestion["reason"]
+        # Each suggestion should be valid
+        for suggestion in data["suggestions"]:
+            assert suggestion["title"]
+            assert suggestion["reason"]
 
-    def test_keyword_variation_responses(self):
+    @pytest.mark.parametrize("prompt", [
+        "superhero movies",
+        "comic book films", 
+        "Marvel and DC movies"
+    ])
+    def test_keyword_variation_responses(self, client, prompt):
         """Test that keyword variations produce relevant suggestions"""
-        similar_prompts = [
-            "superhero movies",
-            "comic book films", 
-            "Marvel and DC movies"
-        ]
-        
-        responses = []
-        for prompt in similar_prompts:
-            response = self.client.post(
-                "/suggest",
-                json={"prompt": prompt}
-            )
-            assert response.status_code == 200
-            responses.append(response.json())
+        response = client.post(
+            "/suggest",
+            json={"prompt": prompt}
+        )
+        assert response.status_code == 200
         
-        # All responses should have suggestions
-        for response_data in responses:
-            assert len(response_data["suggestions"]) >= 3
+        # Every variation should have suggestions
+        assert len(response.json()["suggestions"]) >= 3
 
-    def test_end_to_end_workflow(self):
+    def test_end_to_end_workflow(self, client):
         """Test complete end-to-end workflow for movie suggestion"""
         # Step 1: Make suggestion request
-        response = self.client.post(
+        response = client.post(
             "/suggest",
-            json={"prompt": "action movies"}
+            json=ACTION_MOVIES_REQUEST
         )
         assert response.status_code == 200
         
@@ -122,27 +117,27 @@ class TestMovieSuggesterIntegration:
             assert suggestion["year"] >= 1900
             assert suggestion["year"] <= 2030
 
-    def test_error_handling_integration(self):
+    def test_error_handling_integration(self, client):
         """Test error handling for various invalid inputs"""
         
         # Test missing prompt
-        response = self.client.post("/suggest", json={})
+        response = client.post("/suggest", json={})
         assert response.status_code == 422
         
         # Test empty prompt
-        response = self.client.post("/suggest", json={"prompt": ""})
+        response = client.post("/suggest", json={"prompt": ""})
         assert response.status_code == 422
         
         # Test overly long prompt
         long_prompt = "a" * 1501  # Exceeds max_length
-        response = self.client.post("/suggest", json={"prompt": long_prompt})
+        response = client.post("/suggest", json={"prompt": long_prompt})
         assert response.status_code == 422
 
-    def test_response_consistency(self):
+    def test_response_consistency(self, client):
         """Test that API responses are consistent across multiple calls"""
-        response = self.client.post(
+        response = client.post(
             "/suggest", 
-            json={"prompt": "action movies"}
+            json=ACTION_MOVIES_REQUEST
         )
         assert response.status_code == 200
         
@@ -152,18 +147,29 @@ class TestMovieSuggesterIntegration:
         
         # Test multiple calls for consistency
         for _ in range(3):
-            repeat_response = self.client.post(
+            repeat_response = client.post(
                 "/suggest",
-                json={"prompt": "action movies"}
+                json=ACTION_MOVIES_REQUEST
             )
             assert repeat_response.status_code == 200
             repeat_data = repeat_response.json()
             assert len(repeat_data["suggestions"]) == len(suggestions)
 
-    def test_multilingual_prompt_handling(self):
+    async def test_concurrent_requests(self, aclient):
+        """Test that truly concurrent requests are all answered consistently"""
+        responses = await asyncio.gather(*[
+            aclient.post("/suggest", json=ACTION_MOVIES_REQUEST)
+            for _ in range(5)
+        ])
+        
+        assert all(response.status_code == 200 for response in responses)
+        suggestion_counts = {len(response.json()["suggestions"]) for response in responses}
+        assert len(suggestion_counts) == 1
+
+    def test_multilingual_prompt_handling(self, client):
         """Test that API handles multilingual prompts with automatic detection"""
         # Test Spanish prompt - should work with automatic detection
-        response = self.client.post(
+        response = client.post(
             "/suggest",
             json={"prompt": "películas de acción"}
         )
@@ -172,60 +178,92 @@ class TestMovieSuggesterIntegration:
         assert "suggestions" in data
         assert len(data["suggestions"]) >= 3
 
-    def test_special_characters_handling(self):
+    @pytest.mark.parametrize("prompt", [
+        "movies with $ millions budget",
+        "films from the 90's era",
+        "sci-fi movies with aliens & robots"
+    ])
+    def test_special_characters_handling(self, client, prompt):
         """Test API handling of prompts with special characters"""
-        special_prompts = [
-            "movies with $ millions budget",
-            "films from the 90's era",
-            "sci-fi movies with aliens & robots"
-        ]
+        response = client.post(
+            "/suggest",
+            json={"prompt": prompt}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["suggestions"]) >= 3
+
+    @pytest.mark.parametrize("prompt", [
+        "a",
+        "   ",
+        "?!",
+        "🎬🍿",
+        "アニメ映画",
+        "películas de acción 🎬",
+        "<script>alert('x')</script>",
+        "Robert'); DROP TABLE movies;--",
+        "a" * 1500
+    ])
+    def test_edge_case_prompts(self, client, prompt):
+        """Test that unusual but valid prompts never break the endpoint"""
+        response = client.post(
+            "/suggest",
+            json={"prompt": prompt}
+        )
+        assert response.status_code == 200
+        assert "suggestions" in response.json()
+
+    def test_endpoint_performance(self, client):
+        """Test that suggestion endpoint responds within reasonable time, cold and warm"""
+        start_time = time.perf_counter()
+        response = client.post(
+            "/suggest",
+            json=ACTION_MOVIES_REQUEST
+        )
+        cold_time = time.perf_counter() - start_time
+        
+        # Cold response should be under 10 seconds for basic suggestions
+        assert cold_time < 10.0
+        assert response.status_code == 200
         
-        for prompt in special_prompts:
-            response = self.client.post(
+        # Repeated prompts are served from the response cache, so the warm path is held to 2 seconds
+        warm_times = []
+        for _ in range(5):
+            start_time = time.perf_counter()
+            response = client.post(
                 "/suggest",
-                json={"prompt": prompt}
+                json=ACTION_MOVIES_REQUEST
             )
+            warm_times.append(time.perf_counter() - start_time)
             assert response.status_code == 200
-            data = response.json()
-            assert len(data["suggestions"]) >= 3
-
-    def test_endpoint_performance(self):
-        """Test that suggestion endpoint responds within reasonable time"""
-        import time
         
-        start_time = time.time()
-        response = self.client.post(
-            "/suggest",
-            json={"prompt": "action movies"}
-        )
-        end_time = time.time()
+        p95 = statistics.quantiles(warm_times, n=20)[-1]
+        assert p95 < 2.0
         
-        # Response should be under 10 seconds for basic suggestions
-        response_time = end_time - start_time
-        assert response_time < 10.0
-        assert response.status_code == 200
+        # Only the cold request reached the LLM agent; every warm one was a cache hit
+        assert main.llm_agent.generated_prompts == [ACTION_MOVIES_REQUEST["prompt"]]
 
-    def test_content_type_validation(self):
+    def test_content_type_validation(self, client):
         """Test that API properly validates content types"""
         # Test with correct JSON content type
-        response = self.client.post(
+        response = client.post(
             "/suggest",
-            json={"prompt": "action movies"}
+            json=ACTION_MOVIES_REQUEST
         )
         assert response.status_code == 200
-        assert "application/json" in response.headers["content-type"]
+        assert response.headers["content-type"] == "application/json"
 
-    def test_api_documentation_accessibility(self):
+    def test_api_documentation_accessibility(self, client):
         """Test that API documentation endpoints are accessible"""
         # Test OpenAPI docs
-        docs_response = self.client.get("/docs")
+        docs_response = client.get("/docs")
         assert docs_response.status_code == 200
         
         # Test ReDoc
-        redoc_response = self.client.get("/redoc")
+        redoc_response = client.get("/redoc")
         assert redoc_response.status_code == 200
 
-    def test_suggestion_variety(self):
+    def test_suggestion_variety(self, client):
         """Test that API returns varied suggestions for different prompts"""
         prompts = [
             "comedy movies",
@@ -236,24 +274,25 @@ class TestMovieSuggesterIntegration:
         
         all_titles = set()
         for prompt in prompts:
-            response = self.client.post(
+            response = client.post(
                 "/suggest",
                 json={"prompt": prompt}
             )
             assert response.status_code == 200
             data = response.json()
             
-            for suggestion in data["suggestions"]:
-                all_titles.add(suggestion["title"])
+            all_titles.update(suggestion["title"] for suggestion in data["suggestions"])
+            if len(all_titles) >= 6:
+                break
         
         # Should have variety in suggestions across different prompts
         assert len(all_titles) >= 6  # At least 6 unique titles across all prompts
 
-    def test_suggestion_reasoning_quality(self):
+    def test_suggestion_reasoning_quality(self, client):
         """Test that suggestions include meaningful reasoning"""
-        response = self.client.post(
+        response = client.post(
             "/suggest",
-            json={"prompt": "action movies"}
+            json=ACTION_MOVIES_REQUEST
         )
         assert response.status_code == 200
         data = response.json()
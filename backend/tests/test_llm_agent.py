@@ -0,0 +1,176 @@
+"""
+Tests for LLM Agent
+"""
+import json
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import src.llm_agent
+from src.llm_agent import LLMAgent, SuggestionStreamParser
+
+STREAMED_SUGGESTIONS = (
+    '[{"title": "Parasite", "reason": "A sharp class thriller"}, '
+    '{"title": "Coco", "reason": "A warm family story"}]'
+)
+
+
+class FakeCompletions:
+    """Stand-in for the OpenAI chat completions API that records each call"""
+
+    def __init__(self, reply):
+        """Answer every call with reply(user_message)"""
+        self.reply = reply
+        self.calls = []
+
+    async def create(self, **kwargs):
+        """Record the call and wrap the reply like a chat completion"""
+        self.calls.append(kwargs)
+        content = self.reply(kwargs["messages"][-1]["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _suggestions_for(prompt):
+    """One suggestion whose title echoes the prompt, so replies are traceable"""
+    return [{"title": f"Movie for {prompt}", "reason": "Matches the request"}]
+
+
+def _reply(message):
+    """Answer a prompt with suggestions that echo it"""
+    return json.dumps(_suggestions_for(message))
+
+
+@pytest.fixture
+async def agent():
+    """LLM agent with a dummy key whose completions are answered locally"""
+    llm_agent = LLMAgent(api_key="test-key")
+    llm_agent.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=FakeCompletions(_reply))
+    )
+    yield llm_agent
+    await llm_agent.close()
+
+
+def _feed_all(parser, chunks):
+    """Feed every chunk and collect the suggestions completed along the way"""
+    return [suggestion for chunk in chunks for suggestion in parser.feed(chunk)]
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, len(STREAMED_SUGGESTIONS)])
+def test_stream_parser_handles_split_chunks(chunk_size):
+    """Test objects split at any point across chunks are emitted once, when complete"""
+    chunks = [STREAMED_SUGGESTIONS[i:i + chunk_size] for i in range(0, len(STREAMED_SUGGESTIONS), chunk_size)]
+
+    assert _feed_all(SuggestionStreamParser(), chunks) == [
+        {"title": "Parasite", "reason": "A sharp class thriller"},
+        {"title": "Coco", "reason": "A warm family story"}
+    ]
+
+def test_stream_parser_emits_each_object_as_it_closes():
+    """Test a suggestion is returned by the chunk carrying its closing brace"""
+    parser = SuggestionStreamParser()
+
+    assert parser.feed('[{"title": "Parasite", "reason": "Thriller"') == []
+    assert parser.feed('}, {"title": "Co') == [{"title": "Parasite", "reason": "Thriller"}]
+    assert parser.feed('co", "reason": "Family"}]') == [{"title": "Coco", "reason": "Family"}]
+
+def test_stream_parser_handles_escaped_quotes():
+    """Test escaped quotes, including one split from its backslash, do not end the string"""
+    parser = SuggestionStreamParser()
+    chunks = ['[{"title": "The \\', '"Room\\"", "reason": "Say \\"hi\\" }"}]']
+
+    assert _feed_all(parser, chunks) == [{"title": 'The "Room"', "reason": 'Say "hi" }'}]
+
+def test_stream_parser_ignores_braces_inside_strings():
+    """Test braces in titles and reasons do not open or close objects"""
+    chunks = ['[{"title": "Set {It} Off", "rea', 'son": "Not a } brace {"}]']
+
+    assert _feed_all(SuggestionStreamParser(), chunks) == [
+        {"title": "Set {It} Off", "reason": "Not a } brace {"}
+    ]
+
+def test_stream_parser_skips_objects_that_are_not_suggestions():
+    """Test objects without both a title and a reason are dropped"""
+    chunks = ['[{"title": "No reason"}, {"title": "Coco", "reason": "Family", "extra": {"nested": 1}}]']
+
+    assert _feed_all(SuggestionStreamParser(), chunks) == [{"title": "Coco", "reason": "Family"}]
+
+async def test_response_cache_hits_normalized_prompts(agent):
+    """Test prompts differing only in case and whitespace share one completion"""
+    first = await agent.generate_suggestions("Funny   Movies")
+    second = await agent.generate_suggestions("  funny movies ")
+
+    assert second == first
+    assert len(agent.client.chat.completions.calls) == 1
+    assert agent.has_cached_response("FUNNY MOVIES")
+    assert not agent.has_cached_response("sad movies")
+
+async def test_response_cache_returns_copies(agent):
+    """Test mutating returned suggestions never corrupts the cached entry"""
+    suggestions = await agent.generate_suggestions("space movies")
+    suggestions[0]["title"] = "Mutated"
+    suggestions.append({"title": "Extra", "reason": "Extra"})
+
+    assert await agent.generate_suggestions("space movies") == _suggestions_for("space movies")
+
+async def test_response_cache_evicts_least_recently_used(agent, monkeypatch):
+    """Test a cache hit refreshes an entry so the oldest unused prompt is evicted"""
+    monkeypatch.setattr(src.llm_agent, "LLM_RESPONSE_CACHE_SIZE", 2)
+
+    await agent.generate_suggestions("first")
+    await agent.generate_suggestions("second")
+    await agent.generate_suggestions("first")
+    await agent.generate_suggestions("third")
+
+    assert agent.has_cached_response("first")
+    assert not agent.has_cached_response("second")
+    assert agent.has_cached_response("third")
+    assert len(agent.client.chat.completions.calls) == 3
+
+async def test_response_cache_expires_entries(agent, monkeypatch):
+    """Test a cached prompt is answered again by the LLM once its TTL has passed"""
+    now = 1000.0
+    monkeypatch.setattr(src.llm_agent.time, "monotonic", lambda: now)
+
+    await agent.generate_suggestions("latest movies")
+    now += src.llm_agent.LLM_RESPONSE_CACHE_TTL - 1
+    await agent.generate_suggestions("latest movies")
+    assert len(agent.client.chat.completions.calls) == 1
+
+    now += 1
+    assert not agent.has_cached_response("latest movies")
+    await agent.generate_suggestions("latest movies")
+    assert len(agent.client.chat.completions.calls) == 2
+
+async def test_identical_concurrent_prompts_share_one_completion(agent):
+    """Test concurrent requests for the same normalized prompt wait on a single call"""
+    results = await asyncio.gather(
+        agent.generate_suggestions("Space Movies"),
+        agent.generate_suggestions("space  movies"),
+        agent.generate_suggestions("heist movies")
+    )
+
+    assert len(agent.client.chat.completions.calls) == 2
+    assert results[0] == results[1] == _suggestions_for("Space Movies")
+    results[0][0]["title"] = "Mutated"
+    assert results[1] == _suggestions_for("Space Movies")
+    assert not agent._in_flight
+
+async def test_cancelled_caller_does_not_cancel_shared_completion(agent):
+    """Test a caller going away leaves the completion running for the others"""
+    release = asyncio.Event()
+    reply = agent.client.chat.completions.create
+
+    async def slow_create(**kwargs):
+        await release.wait()
+        return await reply(**kwargs)
+
+    agent.client.chat.completions.create = slow_create
+    leaver = asyncio.create_task(agent.generate_suggestions("space movies"))
+    stayer = asyncio.create_task(agent.generate_suggestions("space movies"))
+    await asyncio.sleep(0)
+
+    leaver.cancel()
+    release.set()
+
+    assert await stayer == _suggestions_for("space movies")
+    assert leaver.cancelled()
@@ -0,0 +1,131 @@
+"""
+Tests for Poster Service
+"""
+import httpx
+import orjson
+import pytest
+from src.constants import MAX_CONCURRENT_POSTER_REQUESTS, POSTER_MAX_CONNECTIONS
+from src.poster_service import PosterService
+
+IMDB_SEARCH_RESULT = {
+    "titles": [{
+        "id": "tt6751668",
+        "type": "movie",
+        "primaryTitle": "Parasite",
+        "startYear": 2019,
+        "primaryImage": {"url": "https://m.media-amazon.com/images/parasite.jpg"},
+        "rating": {"aggregateRating": 8.5}
+    }]
+}
+
+
+def _handler(requests, status_code=200, payload=IMDB_SEARCH_RESULT):
+    """Build a mock transport handler that records every request it answers"""
+    def handle(request):
+        requests.append(request)
+        return httpx.Response(status_code, content=orjson.dumps(payload))
+    return handle
+
+
+@pytest.fixture
+async def poster_service():
+    """Poster service whose clients are swapped for mocked transports by each test"""
+    service = PosterService()
+    yield service
+    await service.close()
+
+
+async def _mock_transport(service, handler):
+    """Point both of the service's clients at a mock transport"""
+    await service.close()
+    transport = httpx.MockTransport(handler)
+    service.client = httpx.AsyncClient(transport=transport)
+    service.sync_client = httpx.Client(transport=transport)
+
+def test_connection_pool_limits(monkeypatch):
+    """Test warm connections are capped per batch without capping total concurrency"""
+    created_clients = []
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: created_clients.append(kwargs))
+
+    PosterService()
+
+    assert created_clients[0]["limits"] == httpx.Limits(
+        max_keepalive_connections=MAX_CONCURRENT_POSTER_REQUESTS,
+        max_connections=POSTER_MAX_CONNECTIONS
+    )
+
+def test_build_search_params_cleans_title(poster_service):
+    """Test year and season suffixes are stripped from the search query"""
+    assert poster_service._build_search_params("Parasite (2019)") == {"query": "Parasite", "limit": 1}
+    assert poster_service._build_search_params("Dark Season 2")["query"] == "Dark 2"
+
+def test_parse_poster_response(poster_service):
+    """Test poster and metadata are extracted from an IMDB search response"""
+    poster_info = poster_service._parse_poster_response(IMDB_SEARCH_RESULT, "Parasite")
+    assert poster_info == {
+        "poster_url": "https://m.media-amazon.com/images/parasite.jpg",
+        "imdb_id": "tt6751668",
+        "year": 2019,
+        "rating": 8.5,
+        "type": "movie",
+        "imdb_title": "Parasite"
+    }
+    assert poster_service._parse_poster_response({"titles": []}, "Unknown") is None
+
+async def test_get_poster_data_decodes_response(poster_service):
+    """Test the async lookup sends the cleaned query and decodes the JSON body"""
+    requests = []
+    await _mock_transport(poster_service, _handler(requests))
+
+    poster_info = await poster_service.get_poster_data("Parasite (2019)")
+
+    assert poster_info["imdb_id"] == "tt6751668"
+    assert requests[0].url.params["query"] == "Parasite"
+    assert requests[0].url.params["limit"] == "1"
+
+async def test_get_poster_data_returns_none_on_http_error(poster_service):
+    """Test HTTP errors are logged and reported as no poster"""
+    await _mock_transport(poster_service, _handler([], status_code=503))
+    assert await poster_service.get_poster_data("Parasite") is None
+
+async def test_get_poster_data_sync(poster_service):
+    """Test the blocking lookup shares the async path's parsing"""
+    requests = []
+    await _mock_transport(poster_service, _handler(requests))
+
+    poster_info = poster_service.get_poster_data_sync("Parasite")
+
+    assert poster_info["poster_url"] == "https://m.media-amazon.com/images/parasite.jpg"
+    assert len(requests) == 1
+
+async def test_get_multiple_posters_fetches_each_title_once(poster_service):
+    """Test duplicate titles in a batch are looked up once and all mapped"""
+    requests = []
+    await _mock_transport(poster_service, _handler(requests))
+
+    poster_data = await poster_service.get_multiple_posters(["Parasite", "Coco", "Parasite"])
+
+    assert set(poster_data) == {"Parasite", "Coco"}
+    assert sorted(request.url.params["query"] for request in requests) == ["Coco", "Parasite"]
+
+async def test_sync_client_is_opened_on_first_use():
+    """Test the blocking client pool only exists once a blocking lookup needs it"""
+    service = PosterService()
+    assert "sync_client" not in service.__dict__
+
+    assert service.sync_client is service.sync_client
+    await service.close()
+    assert service.sync_client.is_closed
+
+async def test_close_releases_sync_client_when_async_close_fails(poster_service):
+    """Test a failing async close does not leak the blocking client"""
+    sync_client = poster_service.sync_client
+
+    async def failing_aclose():
+        raise RuntimeError("boom")
+
+    poster_service.client.aclose = failing_aclose
+    await poster_service.close()
+
+    assert sync_client.is_closed
+    del poster_service.client.aclose
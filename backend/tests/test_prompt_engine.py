@@ -0,0 +1,63 @@
+"""
+Tests for Prompt Engine
+"""
+import pytest
+from src.prompt_engine import (
+    CONTEXT_MAX_MOVIES, KNOWLEDGE_SOURCE_SECTION, MOVIE_PROMPT_PREFIX, PromptEngine
+)
+
+SEARCH_CONTEXT = [{
+    "title": "Dune: Part Two",
+    "summary": "Paul Atreides unites with the Fremen.",
+    "published_date": "2024-03-01T09:30:00Z",
+    "url": "https://example.com/dune",
+    "score": 0.9
+}]
+
+
+@pytest.fixture
+def prompt_engine():
+    """Prompt engine with the default templates"""
+    return PromptEngine()
+
+@pytest.mark.parametrize("user_request, search_context, target_language", [
+    ("funny movies", [], "en"),
+    ("películas de terror", [], "es"),
+    ("latest sci-fi", SEARCH_CONTEXT, "ja"),
+    ("unknown language", SEARCH_CONTEXT, "xx"),
+])
+def test_static_prefix_is_identical_across_requests(prompt_engine, user_request, search_context, target_language):
+    """Test every prompt starts with the unescaped static prefix, byte for byte"""
+    prompt = prompt_engine.construct_movie_prompt(user_request, search_context, target_language)
+    assert prompt.startswith(MOVIE_PROMPT_PREFIX)
+    assert '{"title": "Chat Response", "reason": "Your warm conversational response"}' in prompt
+
+@pytest.mark.parametrize("search_context", [[], SEARCH_CONTEXT])
+def test_user_request_with_braces_is_passed_through_literally(prompt_engine, search_context):
+    """Test braces in the user request are not treated as template fields"""
+    user_request = "movies like {title} or {0} {} }{"
+    prompt = prompt_engine.construct_movie_prompt(user_request, search_context)
+    assert prompt.endswith(f"USER INPUT:\n{user_request}")
+
+def test_empty_search_context_uses_knowledge_source(prompt_engine):
+    """Test the LLM-knowledge path fills the context slot with the knowledge source block"""
+    prompt = prompt_engine.construct_movie_prompt("funny movies", [])
+    assert KNOWLEDGE_SOURCE_SECTION in prompt
+    assert "REAL-TIME MOVIE DATA" not in prompt
+    assert "{context_section}" not in prompt
+
+@pytest.mark.parametrize("published_date", ["yesterday", "2024-3-1", "", None, 20240301])
+def test_malformed_published_date_is_omitted(prompt_engine, published_date):
+    """Test only a real ISO date is shown in a context line"""
+    context = [{"title": "Dune", "summary": "Desert epic", "published_date": published_date}]
+    section = prompt_engine._build_context_section(context)
+    assert "1. Dune — Desert epic\n" in section
+    assert "published" not in section
+
+def test_context_lines_are_compact(prompt_engine):
+    """Test context lines carry a valid date and are capped in count"""
+    section = prompt_engine._build_context_section(SEARCH_CONTEXT * (CONTEXT_MAX_MOVIES + 2))
+    assert "1. Dune: Part Two — Paul Atreides unites with the Fremen. (published 2024-03-01)" in section
+    assert f"{CONTEXT_MAX_MOVIES}. Dune" in section
+    assert f"{CONTEXT_MAX_MOVIES + 1}. Dune" not in section
+    assert "https://example.com/dune" not in section
@@ -2,226 +2,264 @@
 Tests for Movie Suggestion Engine
 """
 import pytest
-from unittest.mock import Mock, patch
-from src.suggestion_engine import MovieSuggestionEngine, SuggestionResult
+from itertools import pairwise
+from src.suggestion_engine import SuggestionResult
 from src.movie_data import MovieDatabase, Movie
 
+LONG_PROMPT = "I'm looking for " + "amazing " * 50 + "action movies with great fight scenes"
 
-class TestMovieSuggestionEngine:
-    """Test suite for MovieSuggestionEngine"""
-    
-    def setup_method(self):
-        """Set up test instance"""
-        self.engine = MovieSuggestionEngine(min_suggestions=3)
-    
-    def test_initialization(self):
-        """Test engine initializes correctly"""
-        assert self.engine.min_suggestions == 3
-        assert self.engine.max_suggestions == 4
-        assert isinstance(self.engine.movie_db, MovieDatabase)
-    
-    def test_genre_detection_action(self):
-        """Test genre detection works correctly for action keywords"""
-        genres = self.engine._extract_genres_from_prompt("I want some action movies with fighting")
-        assert "action" in genres
-    
-    def test_genre_detection_comedy(self):
-        """Test genre detection works correctly for comedy keywords"""
-        genres = self.engine._extract_genres_from_prompt("Looking for something funny and hilarious")
-        assert "comedy" in genres
-    
-    def test_genre_detection_animated(self):
-        """Test genre detection works correctly for animated keywords"""
-        genres = self.engine._extract_genres_from_prompt("I love animated movies like Pixar films")
-        assert "animated" in genres
-    
-    def test_genre_detection_sci_fi(self):
-        """Test genre detection works correctly for sci-fi keywords"""
-        genres = self.engine._extract_genres_from_prompt("Science fiction movies about space and robots")
-        assert "sci-fi" in genres
-    
-    def test_genre_detection_romance(self):
-        """Test genre detection works correctly for romance keywords"""
-        genres = self.engine._extract_genres_from_prompt("Romantic movies about love and relationships")
-        assert "romance" in genres
-    
-    def test_genre_detection_multiple(self):
-        """Test genre detection works for multiple genres"""
-        genres = self.engine._extract_genres_from_prompt("Funny action movies with comedy and adventure")
-        assert "comedy" in genres
-        assert "action" in genres
-        assert "adventure" in genres
-    
-    def test_special_genre_cases_superhero(self):
-        """Test special case handling for superhero terms"""
-        genres = self.engine._extract_genres_from_prompt("I love Marvel superhero movies")
-        assert "action" in genres
-    
-    def test_special_genre_cases_rom_com(self):
-        """Test special case handling for romantic comedy"""
-        genres = self.engine._extract_genres_from_prompt("Looking for a good rom-com")
-        assert "romance" in genres
-        assert "comedy" in genres
-    
-    def test_minimum_suggestions_returned(self):
-        """Test that at least 3 suggestions are always returned"""
-        results = self.engine.suggest_movies("movies")
-        assert len(results) >= 3
-        
-        # Test with specific genre
-        results = self.engine.suggest_movies("action movies")
-        assert len(results) >= 3
-    
-    def test_movie_matching_by_genre(self):
-        """Test that relevant movies are returned for each genre"""
-        # Test action genre
-        results = self.engine.suggest_movies("action movies")
-        action_found = any("action" in result.movie.genre for result in results)
-        assert action_found
-        
-        # Test comedy genre
-        results = self.engine.suggest_movies("funny comedy movies")
-        comedy_found = any("comedy" in result.movie.genre for result in results)
-        assert comedy_found
-        
-        # Test animated genre
-        results = self.engine.suggest_movies("animated cartoons")
-        animated_found = any("animated" in result.movie.genre for result in results)
-        assert animated_found
-    
-    def test_response_format_complete(self):
-        """Test all required fields are populated in response"""
-        results = self.engine.suggest_movies("action movies")
-        
-        for result in results:
-            assert isinstance(result, SuggestionResult)
-            assert result.movie.title
-            assert result.movie.genre
-            assert isinstance(result.movie.year, int)
-            assert result.reason
-            assert result.movie.description
-            assert isinstance(result.relevance_score, (int, float))
-    
-    def test_genre_variety_in_results(self):
-        """Test that different genres are represented in multi-genre prompts"""
-        results = self.engine.suggest_movies("action comedy animated movies", count=4)
-        
-        all_genres = set()
-        for result in results:
-            all_genres.update(result.movie.genre)
-        
-        # Should have variety across different genres
-        assert len(all_genres) > 1
-    
-    def test_fallback_for_no_matches(self):
-        """Test fallback logic when no genre matches are found"""
-        results = self.engine.suggest_movies("xyzzyx nonexistent genre")
-        assert len(results) >= 3
-        # Should return popular movies as fallback
-        titles = [r.movie.title for r in results]
-        assert any(title in ["The Shawshank Redemption", "Parasite", "Spirited Away"] for title in titles)
-    
-    def test_empty_prompt_handling(self):
-        """Test handling of empty or minimal prompts"""
-        results = self.engine.suggest_movies("")
-        assert len(results) >= 3
-        
-        results = self.engine.suggest_movies("movie")
-        assert len(results) >= 3
-    
-    def test_long_prompt_handling(self):
-        """Test handling of very long prompts"""
-        long_prompt = "I'm looking for " + "amazing " * 50 + "action movies with great fight scenes"
-        results = self.engine.suggest_movies(long_prompt)
-        assert len(results) >= 3
-        action_found = any("action" in result.movie.genre for result in results)
-        assert action_found
-    
-    def test_special_characters_handling(self):
-        """Test handling of special characters in prompts"""
-        results = self.engine.suggest_movies("action movies!!! @#$%^&*()")
-        assert len(results) >= 3
-        action_found = any("action" in result.movie.genre for result in results)
-        assert action_found
-    
-    def test_scoring_system(self):
-        """Test that scoring system works correctly"""
-        results = self.engine.suggest_movies("action movies with fighting")
-        
-        # Results should be sorted by relevance score
-        scores = [r.relevance_score for r in results]
-        assert scores == sorted(scores, reverse=True)
-        
-        # Top result should have higher score than bottom
-        if len(results) > 1:
-            assert results[0].relevance_score >= results[-1].relevance_score
-    
-    def test_consistency_across_requests(self):
-        """Test that same prompt returns consistent results"""
-        prompt = "action thriller movies"
-        results1 = self.engine.suggest_movies(prompt)
-        results2 = self.engine.suggest_movies(prompt)
-        
-        # Should have same movies (though order might vary due to randomization)
-        titles1 = set(r.movie.title for r in results1)
-        titles2 = set(r.movie.title for r in results2)
-        
-        # At least some overlap expected
-        overlap = len(titles1.intersection(titles2))
-        assert overlap >= 2
-    
-    def test_custom_suggestion_count(self):
-        """Test custom suggestion count parameter"""
-        results = self.engine.suggest_movies("action movies", count=5)
-        assert len(results) >= 3  # Minimum enforced
-        
-        results = self.engine.suggest_movies("action movies", count=2)
-        assert len(results) >= 3  # Minimum enforced even when requesting less
-    
-    def test_error_handling_in_suggest_movies(self):
-        """Test error handling in main suggest_movies method"""
-        # Mock an error in genre extraction
-        with patch.object(self.engine, '_extract_genres_from_prompt', side_effect=Exception("Test error")):
-            results = self.engine.suggest_movies("action movies")
-            assert len(results) >= 3  # Should return emergency fallback
-    
-    def test_genre_scoring_accuracy(self):
-        """Test that genre scoring gives higher scores to better matches"""
-        action_results = self.engine.suggest_movies("intense action movies with explosions")
-        comedy_results = self.engine.suggest_movies("hilarious comedy movies")
-        
-        # Action results should contain action movies
-        action_found = any("action" in result.movie.genre for result in action_results)
-        assert action_found
-        
-        # Comedy results should contain comedy movies  
-        comedy_found = any("comedy" in result.movie.genre for result in comedy_results)
-        assert comedy_found
-    
-    def test_recency_bonus_calculation(self):
-        """Test that recency bonus is calculated correctly"""
-        recent_score = self.engine._calculate_recency_score(2020)
-        old_score = self.engine._calculate_recency_score(1990)
-        
-        assert recent_score >= old_score
-    
-    def test_keyword_score_calculation(self):
-        """Test keyword scoring in titles and descriptions"""
-        movie = Movie(
-            title="Action Hero",
-            genre=["action"],
-            description="Explosive action with great fight scenes",
-            year=2020
-        )
-        
-        score = self.engine._calculate_keyword_score(movie, "action fight explosive")
-        assert score > 0
-    
-    def test_reason_generation_quality(self):
-        """Test that generated reasons are contextual and informative"""
-        results = self.engine.suggest_movies("action movies")
-        
-        for result in results:
-            reason = result.reason
-            assert len(reason) > 10  # Should be substantive
-            assert reason != result.movie.description  # Should be contextual, not just description 
\ No newline at end of file
+
+def _assert_min_results(results, minimum=3):
+    """Assert the engine returned at least the minimum number of suggestions"""
+    assert len(results) >= minimum, f"Expected at least {minimum} suggestions, got {len(results)}"
+
+
+def _genres_in(results):
+    """Every genre across a list of suggestion results"""
+    return {genre for result in results for genre in result.movie.genre}
+
+
+def test_initialization(engine):
+    """Test engine initializes correctly"""
+    assert engine.min_suggestions == 3
+    assert engine.max_suggestions == 4
+    assert isinstance(engine.movie_db, MovieDatabase)
+
+@pytest.mark.parametrize("prompt, expected_genre", [
+    ("I want some action movies with fighting", "action"),
+    ("Looking for something funny and hilarious", "comedy"),
+    ("I love animated movies like Pixar films", "animated"),
+    ("Science fiction movies about space and robots", "sci-fi"),
+    ("Romantic movies about love and relationships", "romance"),
+])
+def test_genre_detection(engine, prompt, expected_genre):
+    """Test genre detection works correctly for each genre's keywords"""
+    genres = engine._extract_genres_from_prompt(prompt)
+    assert expected_genre in genres
+
+def test_genre_detection_multiple(engine):
+    """Test genre detection works for multiple genres"""
+    genres = engine._extract_genres_from_prompt("Funny action movies with comedy and adventure")
+    assert "comedy" in genres
+    assert "action" in genres
+    assert "adventure" in genres
+
+def test_special_genre_cases_superhero(engine):
+    """Test special case handling for superhero terms"""
+    genres = engine._extract_genres_from_prompt("I love Marvel superhero movies")
+    assert "action" in genres
+
+def test_special_genre_cases_rom_com(engine):
+    """Test special case handling for romantic comedy"""
+    genres = engine._extract_genres_from_prompt("Looking for a good rom-com")
+    assert "romance" in genres
+    assert "comedy" in genres
+
+def test_genre_detection_overlapping_keywords(engine):
+    """Test keywords that share a prefix are all detected"""
+    # 'adventure' maps to both action and adventure; 'music' prefixes 'musical'
+    genres = engine._extract_genres_from_prompt("A musical adventure")
+    assert {"action", "adventure", "musical"} <= genres
+
+def test_content_preference_detection(engine):
+    """Test content type preference comes from the single keyword scan"""
+    assert engine.extract_user_preferences("a good movie")["content_preference"] == "movies_only"
+    assert engine.extract_user_preferences("a tv show to binge")["content_preference"] == "series_only"
+    assert engine.extract_user_preferences("something fun")["content_preference"] == "mixed"
+
+def test_canned_response_for_greetings_and_help(engine):
+    """Test plain greetings and help questions get a canned reply"""
+    assert engine.get_canned_response("Hello")[0]["title"] == "Chat Response"
+    assert engine.get_canned_response("Good morning.")[0]["title"] == "Chat Response"
+    assert engine.get_canned_response("What can you do?")[0]["title"] == "Help Response"
+    assert engine.get_canned_response("Help!")[0]["title"] == "Help Response"
+    assert engine.get_canned_response("What are your capabilities?")[0]["title"] == "Help Response"
+    assert engine.get_canned_response("   ")[0]["title"] == "Help Response"
+    assert engine.get_canned_response("?!")[0]["title"] == "Help Response"
+
+def test_no_canned_response_for_requests(engine):
+    """Test movie requests are never answered with a canned reply"""
+    assert engine.get_canned_response("help me find horror movies") is None
+    assert engine.get_canned_response("Hi, I want action movies") is None
+
+@pytest.mark.parametrize("prompt", [
+    "Help me find something like Parasite",
+    "What is this year's Oscar winner?",
+    "what can you do with Christopher Nolan picks",
+    "who are you going to pick for Parasite fans",
+    "explain why Inception is so popular",
+])
+def test_no_canned_response_for_requests_starting_with_help_phrases(engine, prompt):
+    """Test a help phrase only gets the canned reply when it is the whole message"""
+    assert engine.get_canned_response(prompt) is None
+
+@pytest.mark.parametrize("prompt", [
+    "help me pick something for a date night with my partner",
+    "explain the ending of Inception and suggest similar films",
+])
+def test_help_phrase_requests_stay_conversational_for_routing(engine, prompt):
+    """Test the stricter canned-reply pattern does not change conversational detection"""
+    assert engine.extract_user_preferences(prompt)["is_conversational"]
+    assert engine.get_canned_response(prompt) is None
+
+def test_model_routing(engine):
+    """Test simple requests route to the small model and complex ones to the large model"""
+    simple = engine.extract_user_preferences("funny movies")
+    assert engine.select_model(simple) == "small"
+    
+    multi_genre = engine.extract_user_preferences("a scary comedy with romance")
+    assert engine.select_model(multi_genre) == "large"
+    
+    long_prompt = engine.extract_user_preferences(
+        "I want something my whole family can watch together on a rainy sunday afternoon"
+    )
+    assert engine.select_model(long_prompt) == "large"
+
+def test_minimum_suggestions_returned(engine):
+    """Test that at least 3 suggestions are always returned"""
+    results = engine.suggest_movies("movies")
+    _assert_min_results(results)
+    
+    # Test with specific genre
+    results = engine.suggest_movies("action movies")
+    _assert_min_results(results)
+
+def test_movie_matching_by_genre(engine):
+    """Test that relevant movies are returned for each genre"""
+    # Test action genre
+    results = engine.suggest_movies("action movies")
+    assert "action" in _genres_in(results)
+    
+    # Test comedy genre
+    results = engine.suggest_movies("funny comedy movies")
+    assert "comedy" in _genres_in(results)
+    
+    # Test animated genre
+    results = engine.suggest_movies("animated cartoons")
+    assert "animated" in _genres_in(results)
+
+def test_response_format_complete(engine):
+    """Test all required fields are populated in response"""
+    results = engine.suggest_movies("action movies")
+    
+    for result in results:
+        assert isinstance(result, SuggestionResult)
+        assert result.movie.title
+        assert result.movie.genre
+        assert isinstance(result.movie.year, int)
+        assert result.reason
+        assert result.movie.description
+        assert isinstance(result.relevance_score, (int, float))
+
+def test_genre_variety_in_results(engine):
+    """Test that different genres are represented in multi-genre prompts"""
+    results = engine.suggest_movies("action comedy animated movies", count=4)
+    
+    # Should have variety across different genres
+    assert len(_genres_in(results)) > 1
+
+def test_fallback_for_no_matches(engine):
+    """Test fallback logic when no genre matches are found"""
+    results = engine.suggest_movies("xyzzyx nonexistent genre")
+    _assert_min_results(results)
+    # Should return popular movies as fallback
+    titles = [r.movie.title for r in results]
+    assert any(title in ["The Shawshank Redemption", "Parasite", "Spirited Away"] for title in titles)
+
+@pytest.mark.parametrize("prompt, expected_genre", [
+    ("", None),
+    ("movie", None),
+    (LONG_PROMPT, "action"),
+    ("action movies!!! @#$%^&*()", "action"),
+], ids=["empty", "minimal", "long", "special-characters"])
+def test_prompt_robustness(engine, prompt, expected_genre):
+    """Test empty, minimal, very long and special-character prompts still get suggestions"""
+    results = engine.suggest_movies(prompt)
+    _assert_min_results(results)
+    if expected_genre:
+        assert expected_genre in _genres_in(results)
+
+def test_scoring_system(engine):
+    """Test that scoring system works correctly"""
+    results = engine.suggest_movies("action movies with fighting")
+    
+    # Results should be sorted by relevance score
+    assert all(
+        higher.relevance_score >= lower.relevance_score
+        for higher, lower in pairwise(results)
+    )
+    
+    # Top result should have higher score than bottom
+    if len(results) > 1:
+        assert results[0].relevance_score >= results[-1].relevance_score
+
+def test_consistency_across_requests(engine):
+    """Test that same prompt returns consistent results"""
+    prompt = "action thriller movies"
+    results1 = engine.suggest_movies(prompt)
+    results2 = engine.suggest_movies(prompt)
+    
+    # Should have same movies (though order might vary due to randomization)
+    titles1 = set(r.movie.title for r in results1)
+    titles2 = set(r.movie.title for r in results2)
+    
+    # At least some overlap expected
+    overlap = len(titles1.intersection(titles2))
+    assert overlap >= 2
+
+def test_custom_suggestion_count(engine):
+    """Test custom suggestion count parameter"""
+    results = engine.suggest_movies("action movies", count=5)
+    _assert_min_results(results)  # Minimum enforced
+    
+    results = engine.suggest_movies("action movies", count=2)
+    _assert_min_results(results)  # Minimum enforced even when requesting less
+
+def test_error_handling_in_suggest_movies(engine, monkeypatch):
+    """Test error handling in main suggest_movies method"""
+    def failing_extraction(*args, **kwargs):
+        raise Exception("Test error")
+    
+    # Inject an error in genre extraction
+    monkeypatch.setattr(engine, "_extract_genres_from_prompt", failing_extraction)
+    results = engine.suggest_movies("action movies")
+    _assert_min_results(results)  # Should return emergency fallback
+
+def test_genre_scoring_accuracy(engine):
+    """Test that genre scoring gives higher scores to better matches"""
+    action_results = engine.suggest_movies("intense action movies with explosions")
+    comedy_results = engine.suggest_movies("hilarious comedy movies")
+    
+    # Action results should contain action movies
+    assert "action" in _genres_in(action_results)
+    
+    # Comedy results should contain comedy movies  
+    assert "comedy" in _genres_in(comedy_results)
+
+def test_recency_bonus_calculation(engine):
+    """Test that recency bonus is calculated correctly"""
+    recent_score = engine._calculate_recency_score(2020)
+    old_score = engine._calculate_recency_score(1990)
+    
+    assert recent_score >= old_score
+
+def test_keyword_score_calculation(engine):
+    """Test keyword scoring in titles and descriptions"""
+    movie = Movie(
+        title="Action Hero",
+        genre=["action"],
+        description="Explosive action with great fight scenes",
+        year=2020
+    )
+    
+    score = engine._calculate_keyword_score(movie, "action fight explosive")
+    assert score > 0
+
+def test_reason_generation_quality(engine):
+    """Test that generated reasons are contextual and informative"""
+    results = engine.suggest_movies("action movies")
+    
+    for result in results:
+        reason = result.reason
+        assert len(reason) > 10  # Should be substantive
+        assert reason != result.movie.description  # Should be contextual, not just description 
\ No newline at end of file
@@ -9,7 +9,7 @@ import {
   scrollToBottom 
 } from '@/utils/messageUtils';
 import { useSendSuggestionRequest } from './useApi';
-import { SuggestionRequest, MovieSuggestion } from '../types/api';
+import { SuggestionRequest, MovieSuggestion, StreamedSuggestion } from '../types/api';
 import { MovieService } from '../services/movieService';
 
 interface UseChatOptions {
@@ -214,6 +214,7 @@ export const useChat = ({
             // Use streaming API for real-time response
             let streamingMessageId: string | null = null;
             let streamingMessage: any = null;
+            const earlySuggestions: MovieSuggestion[] = [];
             
             const response = await MovieService.getSuggestionsStream(
               request,
@@ -261,6 +262,28 @@ export const useChat = ({
                     )
                   }));
                 }
+              },
+              // onSuggestion callback - show each suggestion as soon as the model finishes it
+              (suggestion: StreamedSuggestion) => {
+                earlySuggestions.push({
+                  title: suggestion.title,
+                  reason: suggestion.reason,
+                  genre: [],
+                  year: new Date().getFullYear(),
+                  description: '',
+                  content_type: 'movie'
+                });
+                
+                if (streamingMessageId) {
+                  setChatState(prevState => ({
+                    ...prevState,
+                    messages: prevState.messages.map(msg => 
+                      msg.id === streamingMessageId 
+                        ? { ...msg, suggestions: [...earlySuggestions] }
+                        : msg
+                    )
+                  }));
+                }
               }
             );
             
@@ -1,4 +1,4 @@
-import { SuggestionRequest, SuggestionResponse, HealthResponse } from '../types/api';
+import { SuggestionRequest, SuggestionResponse, StreamedSuggestion, HealthResponse } from '../types/api';
 import apiClient, { withRetry } from '../utils/apiClient';
 
 // Movie Suggestion Service
@@ -22,14 +22,15 @@ export class MovieService {
   static async getSuggestionsStream(
     request: SuggestionRequest,
     onChunk?: (chunk: string) => void,
-    onStatus?: (status: string) => void
+    onStatus?: (status: string) => void,
+    onSuggestion?: (suggestion: StreamedSuggestion) => void
   ): Promise<SuggestionResponse> {
     // Validate request
     this.validateSuggestionRequest(request);
 
     return new Promise((resolve, reject) => {
       // We'll use fetch with streaming instead of EventSource for POST
-      this.handleStreamingRequest(request, onChunk, onStatus)
+      this.handleStreamingRequest(request, onChunk, onStatus, onSuggestion)
         .then(resolve)
         .catch(reject);
     });
@@ -39,7 +40,8 @@ export class MovieService {
   private static async handleStreamingRequest(
     request: SuggestionRequest,
     onChunk?: (chunk: string) => void,
-    onStatus?: (status: string) => void
+    onStatus?: (status: string) => void,
+    onSuggestion?: (suggestion: StreamedSuggestion) => void
   ): Promise<SuggestionResponse> {
     const baseURL = apiClient.defaults.baseURL || 'http://localhost:8000';
     const url = `${baseURL}/suggest/stream`;
@@ -109,6 +111,10 @@ export class MovieService {
                   onStatus(data.status);
                 }
                 
+                if (data.suggestion && onSuggestion) {
+                  onSuggestion(data.suggestion);
+                }
+                
                 if (data.final_result) {
                   console.log('🎯 Received final result:', data.final_result);
                   finalResult = data.final_result;
@@ -33,6 +33,12 @@ export interface SuggestionResponse {
   suggestions: MovieSuggestion[];
 }
 
+// A suggestion streamed as soon as the model finishes it, before poster enrichment
+export interface StreamedSuggestion {
+  title: string;
+  reason: string;
+}
+
 export interface HealthResponse {
   status: string;
   service: string;